@@ -5,7 +5,10 @@
 Обеспечивает централизованный и безопасный доступ к конфигурационным данным.
 """
 
-from pydantic import Field, computed_field
+import os
+from functools import cached_property, lru_cache
+
+from pydantic import Field, PrivateAttr, computed_field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -16,7 +19,7 @@ class Settings(BaseSettings):
     Атрибуты:
         bot_token (str): Секретный токен для доступа к Telegram Bot API.
         admin_ids_str (str): Список Telegram ID администраторов в виде строки.
-        admin_ids (list[int]): Сгенерированный список ID администраторов.
+        admin_ids (tuple[int, ...]): Сгенерированный кортеж ID администраторов.
         google_sheet_id (str): ID Google-таблицы для хранения заявок.
         google_drive_folder_id (str): ID папки на Google Drive для хранения фото.
     """
@@ -37,14 +40,15 @@ class Settings(BaseSettings):
         ..., description="Telegram Chat ID for technical service notifications"
     )
 
-    # 2. Создаем вычисляемое поле, которое будет доступно как `settings.admin_ids`
+    # 2. Создаем вычисляемое поле, которое будет доступно как `settings.admin_ids`.
+    # Значение вычисляется один раз и кэшируется: строка не меняется после загрузки.
     @computed_field
-    @property
-    def admin_ids(self) -> list[int]:
-        """Преобразует строку admin_ids_str в список целых чисел."""
+    @cached_property
+    def admin_ids(self) -> tuple[int, ...]:
+        """Преобразует строку admin_ids_str в кортеж целых чисел."""
         if not self.admin_ids_str:
-            return []
-        return [int(item.strip()) for item in self.admin_ids_str.split(",")]
+            return ()
+        return tuple(int(item.strip()) for item in self.admin_ids_str.split(","))
 
     # --- Google API Settings ---
     google_sheet_id: str = Field(..., description="Google Sheet ID for requests")
@@ -65,13 +69,53 @@ class Settings(BaseSettings):
     )
 
     @computed_field
-    @property
-    def issue_types(self) -> list[str]:
-        """Преобразует строку issue_types_str в список строк."""
+    @cached_property
+    def issue_types(self) -> tuple[str, ...]:
+        """Преобразует строку issue_types_str в кортеж строк."""
         if not self.issue_types_str:
-            return []
-        return [item.strip() for item in self.issue_types_str.split(",")]
+            return ()
+        return tuple(item.strip() for item in self.issue_types_str.split(","))
+
+    # --- Множество для быстрой проверки принадлежности (O(1)) ---
+    _issue_types_set: frozenset[str] = PrivateAttr(default_factory=frozenset)
+
+    @model_validator(mode="after")
+    def _build_issue_types_set(self) -> "Settings":
+        """Заранее строит множество типов поломок."""
+        self._issue_types_set = frozenset(self.issue_types)
+        return self
+
+    @property
+    def issue_types_set(self) -> frozenset[str]:
+        """Множество типов поломок для проверки через `in`."""
+        return self._issue_types_set
+
+
+ENV_FILE = ".env"
+
+
+def _all_fields_in_environ() -> bool:
+    """Проверяет, заданы ли все поля настроек через переменные окружения."""
+    env_keys = {key.lower() for key in os.environ}
+    return all(
+        (field.alias or name).lower() in env_keys
+        for name, field in Settings.model_fields.items()
+    )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Возвращает единственный экземпляр настроек.
+
+    Повторные вызовы не перечитывают .env и не валидируют поля заново.
+    Переменные окружения имеют приоритет над .env, поэтому если все поля
+    уже заданы через окружение (например, в контейнере), файл не читается.
+    """
+    if _all_fields_in_environ() or not os.path.exists(ENV_FILE):
+        return Settings(_env_file=None)
+    return Settings(_env_file=ENV_FILE)
 
 
 # Создаем единственный экземпляр настроек, который будет использоваться во всем приложении
-settings = Settings()
+settings = get_settings()
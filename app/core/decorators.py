@@ -4,15 +4,38 @@
 
 import logging
 from functools import wraps
-from typing import Any, Callable, Coroutine
+from typing import TYPE_CHECKING, Any, Callable, Coroutine
 
+from cachetools import TTLCache
 from telegram import Update
 from telegram.ext import ContextTypes
 
-from app.services.user_service import UserService
+from app.models.user import normalize_role
+
+if TYPE_CHECKING:
+    from app.services.user_service import UserService
 
 logger = logging.getLogger(__name__)
 
+# Неизвестные боту пользователи, которым недавно отказали в доступе.
+# Повторные попытки в течение окна отклоняются молча: без записи в лог
+# и без ответного сообщения, чтобы перебор команд не нагружал бота
+REJECTION_TTL_SECONDS = 60
+REJECTION_CACHE_SIZE = 1024
+_recent_rejections: TTLCache[int, bool] = TTLCache(
+    maxsize=REJECTION_CACHE_SIZE, ttl=REJECTION_TTL_SECONDS
+)
+
+
+def _is_recently_rejected(telegram_id: int) -> bool:
+    """
+    Проверяет, отказывали ли пользователю недавно, и запоминает текущий отказ.
+    """
+    if telegram_id in _recent_rejections:
+        return True
+    _recent_rejections[telegram_id] = True
+    return False
+
 
 def require_role(*roles: str) -> Callable:
     """
@@ -25,6 +48,10 @@ def require_role(*roles: str) -> Callable:
         Декоратор, который можно применить к обработчику python-telegram-bot.
     """
 
+    # Множество ролей строим один раз при декорировании, а не на каждый вызов.
+    # Роли нормализуются так же, как в модели User
+    allowed_roles = frozenset(normalize_role(role) for role in roles)
+
     def decorator(
         func: Callable[[Update, ContextTypes.DEFAULT_TYPE], Coroutine[Any, Any, None]],
     ):
@@ -35,17 +62,24 @@ def require_role(*roles: str) -> Callable:
                 return  # Не должно происходить в обычных чатах
 
             user_service: UserService = context.application.bot_data["user_service"]
-            db_user = user_service.get_user_by_id(user.id)
+            db_user = await user_service.get_user_by_id(user.id)
 
-            if db_user and db_user.role in roles:
+            if db_user and db_user.role in allowed_roles:
                 # Сохраняем данные о пользователе в контекст для удобного доступа
                 context.user_data["db_user"] = db_user
                 return await func(update, context)
+            elif db_user is None and _is_recently_rejected(user.id):
+                if update.callback_query:
+                    await update.callback_query.answer()
             else:
                 role_str = db_user.role if db_user else "Unauthorized"
                 logger.warning(
-                    f"Unauthorized access attempt by user {user.id} ({user.username}). "
-                    f"User role: '{role_str}'. Required roles: {roles}"
+                    "Unauthorized access attempt by user %s (%s). "
+                    "User role: '%s'. Required roles: %s",
+                    user.id,
+                    user.username,
+                    role_str,
+                    roles,
                 )
                 # Отвечаем на callback_query, если он есть, иначе в чат
                 if update.callback_query:
@@ -2,28 +2,63 @@
 Модуль для конфигурации логирования.
 
 Определяет единый формат и настройки для всех логгеров в приложении.
+Запись в stdout выполняется в отдельном потоке через очередь, чтобы
+вывод логов не блокировал цикл событий бота.
 """
 
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 
+# Формат с информацией о месте вызова (используется только в режиме отладки)
+DEBUG_LOG_FORMAT = "%(asctime)s - [%(levelname)s] - %(name)s - (%(filename)s).%(funcName)s(%(lineno)d) - %(message)s"
+LOG_FORMAT = "%(asctime)s - [%(levelname)s] - %(name)s - %(message)s"
 
-def setup_logging(level: int = logging.INFO) -> None:
+
+def setup_logging(level: int = logging.INFO) -> QueueListener:
     """
-    Настраивает базовую конфигурацию логирования для вывода в stdout.
+    Настраивает логирование в stdout через очередь и фоновый поток.
 
     Args:
         level: Уровень логирования (INFO, DEBUG и т.д.).
+
+    Returns:
+        Запущенный QueueListener. Его нужно остановить при завершении работы,
+        чтобы дописать оставшиеся в очереди записи.
     """
-    # Определяем формат логов для консистентности
-    log_format = "%(asctime)s - [%(levelname)s] - %(name)s - (%(filename)s).%(funcName)s(%(lineno)d) - %(message)s"
+    # Не собираем для каждой записи атрибуты, которые не выводим
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging.logAsyncioTasks = False
+
+    if level <= logging.DEBUG:
+        log_format = DEBUG_LOG_FORMAT
+    else:
+        log_format = LOG_FORMAT
+        # Без _srcfile модуль logging не обходит стек (findCaller) для каждой записи
+        logging._srcfile = None
 
     # Создаем обработчик, который будет выводить логи в стандартный вывод (консоль)
     stdout_handler = logging.StreamHandler(sys.stdout)
     stdout_handler.setFormatter(logging.Formatter(log_format))
 
+    # Обработчики логгеров только кладут записи в очередь,
+    # а запись в stdout выполняет фоновый поток
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, stdout_handler, respect_handler_level=True)
+    listener.start()
+
+    # QueueHandler сам подставляет аргументы в сообщение (и трейсбек),
+    # окончательное форматирование выполняет stdout_handler
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+
     # Настраиваем корневой логгер
-    logging.basicConfig(level=level, handlers=[stdout_handler])
+    logging.basicConfig(level=level, handlers=[queue_handler])
 
     # Устанавливаем уровень WARNING для "шумных" библиотек
     logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    return listener
@@ -3,50 +3,97 @@
 """
 
 import logging
+from typing import TYPE_CHECKING, Any, Callable, Coroutine
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
-from telegram.constants import ParseMode
+from telegram.constants import InlineKeyboardMarkupLimit, MessageLimit, ParseMode
 from telegram.ext import ContextTypes
 
 from app.core.decorators import require_role
 from app.models.user import User
-from app.services.user_service import UserService
+
+if TYPE_CHECKING:
+    from app.services.user_service import UserService
 
 logger = logging.getLogger(__name__)
 
+USER_LIST_HEADER = "--- 👥 Список пользователей ---"
+INVALID_ID_MESSAGE = "⚠️ **Ошибка:** Telegram ID должен быть числом."
+
+
+def _parse_tg_id(arg: str) -> int | None:
+    """
+    Преобразует аргумент команды в Telegram ID.
+
+    Возвращает None, если аргумент не является целым числом.
+    """
+    return int(arg) if arg.removeprefix("-").isdecimal() else None
+
+
+def _format_user_card(user: User) -> str:
+    """Формирует текстовую карточку пользователя."""
+    return (
+        f"👤 <b>{user.name}</b>\n"
+        f"   ID: <code>{user.telegram_id}</code>\n"
+        f"   Роль: <i>{user.role}</i>"
+    )
+
+
+def _build_user_list_messages(
+    users: list[User],
+) -> list[tuple[str, InlineKeyboardMarkup]]:
+    """
+    Группирует карточки пользователей в как можно меньшее число сообщений.
+
+    Каждое сообщение укладывается в лимиты Telegram на длину текста и число
+    кнопок, а у каждого пользователя есть своя кнопка удаления.
+    """
+    messages: list[tuple[str, InlineKeyboardMarkup]] = []
+    parts = [USER_LIST_HEADER]
+    length = len(USER_LIST_HEADER)
+    keyboard: list[list[InlineKeyboardButton]] = []
+
+    for user in users:
+        card = _format_user_card(user)
+        if (
+            length + len(card) + 2 > MessageLimit.MAX_TEXT_LENGTH
+            or len(keyboard) >= InlineKeyboardMarkupLimit.TOTAL_BUTTON_NUMBER
+        ):
+            messages.append(("\n\n".join(parts), InlineKeyboardMarkup(keyboard)))
+            parts, length, keyboard = [], 0, []
+        length += len(card) + (2 if parts else 0)
+        parts.append(card)
+        keyboard.append(
+            [
+                InlineKeyboardButton(
+                    f"🗑️ Удалить {user.name}",
+                    callback_data=f"delete_user:{user.telegram_id}",
+                )
+            ]
+        )
+
+    messages.append(("\n\n".join(parts), InlineKeyboardMarkup(keyboard)))
+    return messages
+
 
 @require_role("admin")
 async def list_users(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
-    Выводит список всех пользователей в виде интерактивных карточек с кнопками.
+    Выводит список всех пользователей с кнопками удаления.
     Доступно только для администраторов.
     """
     message = update.effective_message
     user_service: UserService = context.application.bot_data["user_service"]
-    all_users = user_service.get_all_users()
+    all_users = await user_service.get_all_users()
 
     if not all_users:
         await message.reply_text("👥 Список пользователей пуст.")
         return
 
-    await message.reply_text(text="--- 👥 Список пользователей ---")
-    for user in all_users:
-        # Для каждого пользователя создаем свою клавиатуру
-        keyboard = [
-            [
-                InlineKeyboardButton(
-                    "🗑️ Удалить", callback_data=f"delete_user:{user.telegram_id}"
-                )
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        user_info = (
-            f"👤 <b>{user.name}</b>\n"
-            f"   ID: <code>{user.telegram_id}</code>\n"
-            f"   Роль: <i>{user.role}</i>"
-        )
+    # Отправляем список одним сообщением (или несколькими, если он не влезает)
+    for text, reply_markup in _build_user_list_messages(all_users):
         await message.reply_text(
-            text=user_info, parse_mode=ParseMode.HTML, reply_markup=reply_markup
+            text=text, parse_mode=ParseMode.HTML, reply_markup=reply_markup
         )
 
 
@@ -70,16 +117,15 @@ async def add_user(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         )
         return
 
-    try:
-        user_id_to_add = int(context.args[0])
-    except ValueError:
-        await message.reply_text("⚠️ **Ошибка:** Telegram ID должен быть числом.")
+    user_id_to_add = _parse_tg_id(context.args[0])
+    if user_id_to_add is None:
+        await message.reply_text(INVALID_ID_MESSAGE)
         return
 
     role = context.args[1].lower()
     user_service: UserService = context.application.bot_data["user_service"]
 
-    if user_service.get_user_by_id(user_id_to_add):
+    if await user_service.get_user_by_id(user_id_to_add):
         await message.reply_text(
             f"Пользователь с ID <code>{user_id_to_add}</code> уже существует в системе."
         )
@@ -89,16 +135,19 @@ async def add_user(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     new_user = User(telegram_id=user_id_to_add, name=name_placeholder, role=role)
 
     try:
-        user_service.add_user(new_user)
+        await user_service.add_user(new_user)
         await message.reply_text(
             f"✅ Пользователь с ID <code>{new_user.telegram_id}</code> успешно добавлен с ролью `{role}`."
         )
         logger.info(
-            f"Admin {update.effective_user.id} added user {new_user.telegram_id} with role {role}."
+            "Admin %s added user %s with role %s.",
+            update.effective_user.id,
+            new_user.telegram_id,
+            role,
         )
     except Exception as e:
         await message.reply_text("❌ Произошла ошибка при добавлении пользователя.")
-        logger.error(f"Failed to add user: {e}", exc_info=True)
+        logger.error("Failed to add user: %s", e, exc_info=True)
 
 
 @require_role("admin")
@@ -120,20 +169,19 @@ async def delete_user(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
         )
         return
 
-    try:
-        user_id_to_delete = int(context.args[0])
-    except ValueError:
-        await message.reply_text("⚠️ **Ошибка:** Telegram ID должен быть числом.")
+    user_id_to_delete = _parse_tg_id(context.args[0])
+    if user_id_to_delete is None:
+        await message.reply_text(INVALID_ID_MESSAGE)
         return
 
     user_service: UserService = context.application.bot_data["user_service"]
 
-    if user_service.delete_user(user_id_to_delete):
+    if await user_service.delete_user(user_id_to_delete):
         await message.reply_text(
             f"✅ Пользователь с ID <code>{user_id_to_delete}</code> успешно удален."
         )
         logger.info(
-            f"Admin {update.effective_user.id} deleted user {user_id_to_delete}."
+            "Admin %s deleted user %s.", update.effective_user.id, user_id_to_delete
         )
     else:
         await message.reply_text(
@@ -141,6 +189,73 @@ async def delete_user(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
         )
 
 
+def _remove_user_from_list_message(
+    text_html: str, reply_markup: InlineKeyboardMarkup | None, user_id: int
+) -> tuple[str, InlineKeyboardMarkup]:
+    """
+    Убирает из сообщения со списком карточку и кнопку удаленного пользователя.
+
+    В одном сообщении может быть несколько карточек (см.
+    _build_user_list_messages), остальные должны остаться на месте.
+    """
+    id_marker = f"<code>{user_id}</code>"
+    callback_data = f"delete_user:{user_id}"
+    parts = [part for part in text_html.split("\n\n") if id_marker not in part]
+    keyboard = [
+        row
+        for row in (reply_markup.inline_keyboard if reply_markup else ())
+        if not any(button.callback_data == callback_data for button in row)
+    ]
+    return "\n\n".join(parts), InlineKeyboardMarkup(keyboard)
+
+
+async def _handle_delete_user(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, payload: str
+) -> None:
+    """Удаляет пользователя по нажатию кнопки в его карточке."""
+    query = update.callback_query
+    user_id = int(payload)
+
+    user_service: UserService = context.application.bot_data["user_service"]
+    # Права администратора уже проверены декоратором @require_role
+    admin_user: User = context.user_data["db_user"]
+
+    logger.info(
+        "Admin %s initiated deletion of user %s.", admin_user.telegram_id, user_id
+    )
+    if not await user_service.delete_user(user_id):
+        # Список не трогаем: остальные кнопки в сообщении остаются рабочими
+        await query.message.reply_text(
+            f"⚠️ Не удалось удалить. Пользователь <code>{user_id}</code> не найден.",
+            parse_mode=ParseMode.HTML,
+        )
+        return
+
+    confirmation = f"✅ Пользователь <code>{user_id}</code> удален."
+    text, reply_markup = _remove_user_from_list_message(
+        query.message.text_html, query.message.reply_markup, user_id
+    )
+    if not reply_markup.inline_keyboard:
+        # В сообщении не осталось других пользователей: заменяем его подтверждением
+        await query.edit_message_text(text=confirmation, parse_mode=ParseMode.HTML)
+        return
+
+    await query.edit_message_text(
+        text=text, parse_mode=ParseMode.HTML, reply_markup=reply_markup
+    )
+    await query.message.reply_text(confirmation, parse_mode=ParseMode.HTML)
+
+
+# Обработчики callback-действий по префиксу callback_data
+_CALLBACK_HANDLERS: dict[
+    str,
+    Callable[[Update, ContextTypes.DEFAULT_TYPE, str], Coroutine[Any, Any, None]],
+] = {
+    "delete_user": _handle_delete_user,
+}
+
+
+@require_role("admin")
 async def admin_user_callback(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> None:
@@ -151,25 +266,7 @@ async def admin_user_callback(
     await query.answer()  # Обязательно, чтобы убрать "часики" на кнопке
 
     # Парсим callback_data. Формат: "действие:id_пользователя"
-    action, user_id_str = query.data.split(":", 1)
-    user_id = int(user_id_str)
-
-    user_service: UserService = context.application.bot_data["user_service"]
-
-    if action == "delete_user":
-        # Проверяем, что кнопку нажал администратор
-        # Это дополнительный слой безопасности
-        admin_user = user_service.get_user_by_id(query.from_user.id)
-        if not (admin_user and admin_user.role == "admin"):
-            await query.edit_message_text(text="⚠️ У вас нет прав для этого действия.")
-            return
-
-        logger.info(f"Admin {query.from_user.id} initiated deletion of user {user_id}.")
-        if user_service.delete_user(user_id):
-            await query.edit_message_text(
-                text=f"✅ Пользователь <code>{user_id}</code> удален."
-            )
-        else:
-            await query.edit_message_text(
-                text=f"⚠️ Не удалось удалить. Пользователь <code>{user_id}</code> не найден."
-            )
+    action, _, payload = query.data.partition(":")
+    handler = _CALLBACK_HANDLERS.get(action)
+    if handler:
+        await handler(update, context, payload)
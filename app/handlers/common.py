@@ -2,19 +2,39 @@
 Обработчики общих команд, доступных всем пользователям.
 """
 
-import json
+import asyncio
+import html
 import logging
+from typing import TYPE_CHECKING
 
-from telegram import Update
-from telegram.constants import ParseMode
+import orjson
+from telegram import Bot, Update
+from telegram.constants import MessageLimit, ParseMode
 from telegram.ext import ContextTypes
 
 from app.core.decorators import require_role
-from app.services.user_service import UserService
+
+if TYPE_CHECKING:
+    from app.services.user_service import UserService
 
 logger = logging.getLogger(__name__)
 
 
+async def _send_to_admin(bot: Bot, admin_id: int, parts: list[str]) -> None:
+    """
+    Отправляет администратору сообщение, разбитое на части.
+
+    Ошибка отправки логируется и не прерывает рассылку остальным администраторам.
+    """
+    try:
+        for part in parts:
+            await bot.send_message(
+                chat_id=admin_id, text=part, parse_mode=ParseMode.HTML
+            )
+    except Exception as e:
+        logger.error("Failed to send message to admin %s: %s", admin_id, e)
+
+
 @require_role("admin", "housekeeper", "technician")
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
@@ -32,14 +52,21 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     # Проверяем, нужно ли обновить имя
     if db_user.name != current_name:
         logger.info(
-            f"Updating name for user {user.id}: '{db_user.name}' -> '{current_name}'"
+            "Updating name for user %s: '%s' -> '%s'",
+            user.id,
+            db_user.name,
+            current_name,
         )
-        user_service.update_user_name(user.id, current_name)
+        await user_service.update_user_name(user.id, current_name)
         # Обновляем и локальную копию, чтобы показать актуальные данные
-        db_user.name = current_name
+        db_user = db_user.model_copy(update={"name": current_name})
+        context.user_data["db_user"] = db_user
 
     logger.info(
-        f"Authorized user {user.id} ({db_user.name}) with role '{db_user.role}' started the bot."
+        "Authorized user %s (%s) with role '%s' started the bot.",
+        user.id,
+        db_user.name,
+        db_user.role,
     )
 
     await update.message.reply_html(
@@ -55,7 +82,7 @@ async def show_my_id(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
     if not user:
         return
 
-    logger.info(f"User {user.id} requested their ID.")
+    logger.info("User %s requested their ID.", user.id)
     await update.message.reply_text(
         f"Ваш Telegram ID: <code>{user.id}</code>\n\n"
         f"Пожалуйста, отправьте этот ID вашему администратору для получения доступа.",
@@ -70,37 +97,50 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> N
 
     logger.error("Exception while handling an update:", exc_info=context.error)
 
-    # Собираем информацию для отладочного сообщения
-    if isinstance(update, Update):
-        update_str = json.dumps(update.to_dict(), indent=2, ensure_ascii=False)
+    if logger.isEnabledFor(logging.DEBUG):
+        # Полный дамп update собираем только в режиме отладки: to_dict()
+        # обходит весь граф объектов Telegram и дает многокилобайтный текст.
+        # Update.to_json() в PTB — тот же to_dict() плюс json.dumps, поэтому
+        # сериализуем словарь сами через orjson и без отступов: компактный
+        # дамп реже приходится делить на несколько сообщений
+        if isinstance(update, Update):
+            update_str = orjson.dumps(update.to_dict()).decode()
+        else:
+            update_str = str(update)
+        logger.debug("Update that caused the error: %s", update_str)
+
+        # Сообщение размечено HTML: экранируем все подставляемые значения,
+        # иначе символы <, > и & в них сделают сообщение невалидным
+        message = (
+            f"‼️ **Произошла ошибка в боте** ‼️\n\n"
+            f"<pre>update = {html.escape(update_str)}</pre>\n\n"
+            f"<pre>context.chat_data = {html.escape(str(context.chat_data))}</pre>\n\n"
+            f"<pre>context.user_data = {html.escape(str(context.user_data))}</pre>\n\n"
+            f"<pre>{html.escape(str(context.error))}</pre>"
+        )
     else:
-        update_str = str(update)
-
-    message = (
-        f"‼️ **Произошла ошибка в боте** ‼️\n\n"
-        f"<pre>update = {update_str}</pre>\n\n"
-        f"<pre>context.chat_data = {str(context.chat_data)}</pre>\n\n"
-        f"<pre>context.user_data = {str(context.user_data)}</pre>\n\n"
-        f"<pre>{context.error}</pre>"
-    )
+        # Администраторам достаточно краткой сводки, трейсбек уже в логах
+        error_name = html.escape(type(context.error).__name__)
+        message = (
+            f"‼️ **Произошла ошибка в боте** ‼️\n\n"
+            f"<pre>{error_name}: {html.escape(str(context.error))}</pre>"
+        )
 
-    # Отправляем уведомление всем администраторам
-    for admin_id in context.bot_data.get("settings", {}).admin_ids:
-        try:
-            # Разделяем сообщение, если оно слишком длинное
-            if len(message) > 4096:
-                for x in range(0, len(message), 4096):
-                    await context.bot.send_message(
-                        chat_id=admin_id,
-                        text=message[x : x + 4096],
-                        parse_mode=ParseMode.HTML,
-                    )
-            else:
-                await context.bot.send_message(
-                    chat_id=admin_id, text=message, parse_mode=ParseMode.HTML
-                )
-        except Exception as e:
-            logger.error(f"Failed to send error message to admin {admin_id}: {e}")
+    # Разделяем сообщение один раз для всех администраторов, если оно слишком длинное
+    limit = MessageLimit.MAX_TEXT_LENGTH
+    if len(message) > limit:
+        parts = [message[x : x + limit] for x in range(0, len(message), limit)]
+    else:
+        parts = [message]
+
+    # Отправляем уведомление всем администраторам параллельно
+    await asyncio.gather(
+        *(
+            _send_to_admin(context.bot, admin_id, parts)
+            for admin_id in context.bot_data["admin_ids"]
+        ),
+        return_exceptions=True,
+    )
 
 
 async def unauthorized_user_handler(
@@ -114,7 +154,7 @@ async def unauthorized_user_handler(
         return
 
     logger.warning(
-        f"Received message from unauthorized user {user.id} ({user.first_name})."
+        "Received message from unauthorized user %s (%s).", user.id, user.first_name
     )
 
     # Отправляем уведомление администраторам
@@ -126,13 +166,13 @@ async def unauthorized_user_handler(
         f"Чтобы добавить его, используйте команду:\n"
         f"<code>/adduser {user.id} <роль></code>"
     )
-    for admin_id in context.bot_data.get("settings", {}).admin_ids:
-        try:
-            await context.bot.send_message(
-                chat_id=admin_id, text=admin_message, parse_mode=ParseMode.HTML
-            )
-        except Exception as e:
-            logger.error(f"Failed to send unauthorized notice to admin {admin_id}: {e}")
+    await asyncio.gather(
+        *(
+            _send_to_admin(context.bot, admin_id, [admin_message])
+            for admin_id in context.bot_data["admin_ids"]
+        ),
+        return_exceptions=True,
+    )
 
     # Отвечаем самому пользователю
     await update.message.reply_text(
@@ -2,7 +2,10 @@
 Обработчики для создания и управления заявками на ремонт.
 """
 
+import asyncio
+import html
 import logging
+from typing import TYPE_CHECKING, Any, Callable, Coroutine
 
 from telegram import (
     InlineKeyboardButton,
@@ -19,9 +22,13 @@ from telegram.ext import (
 from app.core.config import settings
 from app.core.decorators import require_role
 from app.models.request import MaintenanceRequest
-from app.services.google_api import GoogleAPIService
 from app.services.notification_service import NotificationService
 
+if TYPE_CHECKING:
+    # Нужен только для аннотаций: сервис берется из bot_data, а импорт
+    # клиентов Google API при загрузке модуля обходится дорого
+    from app.services.google_api import GoogleAPIService
+
 logger = logging.getLogger(__name__)
 
 # --- Константы для сообщений ---
@@ -30,13 +37,27 @@ SUCCESS_MESSAGE = "✅ Ваша заявка успешно создана и о
 # Определяем состояния диалога
 (LOCATION, ISSUE_TYPE, PHOTO, CONFIRMATION) = range(4)
 
+# Префикс строки статуса — последней строки сообщения с заявкой
+STATUS_PREFIX = "Статус:"
+
+# Клавиатура с типами поломок из конфига. Список типов не меняется
+# во время работы бота, поэтому создаем ее один раз при загрузке модуля.
+_ISSUE_TYPE_KEYBOARD = ReplyKeyboardMarkup(
+    [[issue] for issue in settings.issue_types],
+    one_time_keyboard=True,
+    resize_keyboard=True,
+)
+
 
 @require_role("housekeeper", "admin")
 async def new_request_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Начинает диалог создания новой заявки."""
     message = update.effective_message
     user = update.effective_user
-    context.user_data["current_request"] = MaintenanceRequest(
+    # Данные берутся из объекта Telegram, а не от пользователя,
+    # поэтому валидацию pydantic можно пропустить (значения по умолчанию
+    # model_construct заполняет сам)
+    context.user_data["current_request"] = MaintenanceRequest.model_construct(
         reporter_id=user.id, reporter_name=user.first_name or user.username
     )
 
@@ -52,18 +73,14 @@ async def get_location(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
     """Получает местоположение и запрашивает тип поломки."""
     message = update.effective_message
     location_text = message.text
-    context.user_data["current_request"].location = location_text
-
-    # Создаем клавиатуру с типами поломок из конфига
-    keyboard = [[issue] for issue in settings.issue_types]
-    reply_markup = ReplyKeyboardMarkup(
-        keyboard, one_time_keyboard=True, resize_keyboard=True
-    )
+    context.user_data["current_request"] = context.user_data[
+        "current_request"
+    ].model_copy(update={"location": location_text})
 
     await message.reply_text(
         f"Местоположение: <b>{location_text}</b>\n\n"
         "<b>Шаг 2/3:</b> Выберите тип поломки с помощью кнопок ниже.",
-        reply_markup=reply_markup,
+        reply_markup=_ISSUE_TYPE_KEYBOARD,
         parse_mode="HTML",
     )
     return ISSUE_TYPE
@@ -75,13 +92,15 @@ async def get_issue_type(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     issue_type_text = message.text
 
     # Проверяем, что пользователь выбрал один из предложенных вариантов
-    if issue_type_text not in settings.issue_types:
+    if issue_type_text not in context.bot_data["issue_types_set"]:
         await message.reply_text(
             "Пожалуйста, выберите тип поломки, используя предложенные кнопки."
         )
         return ISSUE_TYPE  # Остаемся на том же шаге
 
-    context.user_data["current_request"].issue_type = issue_type_text
+    context.user_data["current_request"] = context.user_data[
+        "current_request"
+    ].model_copy(update={"issue_type": issue_type_text})
 
     await message.reply_text(
         f"Тип поломки: <b>{issue_type_text}</b>\n\n"
@@ -99,7 +118,7 @@ async def get_photo(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     request: MaintenanceRequest = context.user_data["current_request"]
 
     photo_file = message.photo[-1]
-    request.photo_file_id = photo_file.file_id
+    request = request.model_copy(update={"photo_file_id": photo_file.file_id})
 
     await message.reply_text(
         "Фото получено. Сохраняю заявку, это может занять несколько секунд..."
@@ -107,45 +126,65 @@ async def get_photo(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
     google_api: GoogleAPIService = context.application.bot_data["google_api_service"]
     request_uuid_str = str(request.request_uuid)
+    file_name = f"request_{request_uuid_str}.jpg"
+    photo_url: str | None = None
 
     try:
-        # Шаг 1: Создаем строку со статусом 'creating'
-        request.status = "creating"
-        await google_api.create_request_row(request.model_dump(mode="json"))
-
-        # Шаг 2: Загружаем фото в Drive
-        file_name = f"request_{request_uuid_str}.jpg"
-        photo_url = await google_api.upload_photo_to_drive(
-            file_id=request.photo_file_id, file_name=file_name, bot=context.bot
+        # Шаг 1: Параллельно создаем строку со статусом 'creating'
+        # и загружаем фото в Drive — операции не зависят друг от друга
+        request = request.model_copy(update={"status": "creating"})
+        payload = request.model_dump(mode="json")
+        # Дожидаемся обеих операций, даже если одна упала: откат ниже
+        # должен выполняться только после того, как обе завершились
+        row_result, upload_result = await asyncio.gather(
+            google_api.create_request_row(payload),
+            google_api.upload_photo_to_drive(
+                file_id=request.photo_file_id, file_name=file_name, bot=context.bot
+            ),
+            return_exceptions=True,
         )
+        if not isinstance(upload_result, BaseException):
+            photo_url = upload_result
+        for result in (row_result, upload_result):
+            if isinstance(result, BaseException):
+                raise result
 
         if not photo_url:
             # Используем более конкретный RuntimeError
             raise RuntimeError("Failed to get photo URL from Google Drive")
 
-        # Шаг 3: Обновляем строку, меняя статус на 'new' и добавляя URL
+        # Шаг 2: Обновляем строку, меняя статус на 'new' и добавляя URL
         await google_api.update_request_after_upload(
             request_uuid=request_uuid_str, photo_url=photo_url
         )
+        request = request.model_copy(
+            update={"status": "new", "photo_before_url": photo_url}
+        )
 
-        # Шаг 4: Отправляем уведомление в чат техслужбы
+        # Шаг 3: Отправляем уведомление в чат техслужбы
         await NotificationService.send_new_request_notification(
             bot=context.bot, chat_id=settings.tech_chat_id, request=request
         )
 
         await message.reply_text(SUCCESS_MESSAGE)
 
-        logger.info(f"New request with photo successfully saved: {request_uuid_str}")
+        logger.info("New request with photo successfully saved: %s", request_uuid_str)
 
     except Exception as e:
         logger.error(
-            f"Transactional request creation failed for {request_uuid_str}: {e}",
+            "Transactional request creation failed for %s: %s",
+            request_uuid_str,
+            e,
             exc_info=True,
         )
 
-        # Шаг 4 (Откат): Удаляем "черновую" запись, если что-то пошло не так
-        logger.info(f"Attempting to roll back creation for request {request_uuid_str}")
+        # Откат: Удаляем "черновую" запись, если что-то пошло не так
+        logger.info("Attempting to roll back creation for request %s", request_uuid_str)
         await google_api.delete_request_by_uuid(request_uuid_str)
+        # Фото загружается независимо от вставки строки: если оно успело
+        # загрузиться, удаляем его, чтобы в Drive не оставалось файлов без заявки
+        if photo_url:
+            await google_api.delete_photo_from_drive(file_name)
 
         await message.reply_text(
             "❌ Произошла ошибка при сохранении вашей заявки. Пожалуйста, попробуйте позже. Администраторы уже уведомлены."
@@ -165,8 +204,9 @@ async def skip_photo(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
     try:
         # Так как фото нет, сразу создаем заявку со статусом 'new'
-        request.status = "new"
-        await google_api.create_request_row(request.model_dump(mode="json"))
+        request = request.model_copy(update={"status": "new"})
+        payload = request.model_dump(mode="json")
+        await google_api.create_request_row(payload)
 
         await NotificationService.send_new_request_notification(
             bot=context.bot, chat_id=settings.tech_chat_id, request=request
@@ -174,12 +214,14 @@ async def skip_photo(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
         await message.reply_text(SUCCESS_MESSAGE)
         logger.info(
-            f"New request without photo successfully saved: {request.request_uuid}"
+            "New request without photo successfully saved: %s", request.request_uuid
         )
 
     except Exception as e:
         logger.error(
-            f"Request creation (no photo) failed for {request.request_uuid}: {e}",
+            "Request creation (no photo) failed for %s: %s",
+            request.request_uuid,
+            e,
             exc_info=True,
         )
         await message.reply_text(
@@ -201,58 +243,101 @@ async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     return ConversationHandler.END
 
 
-@require_role("technician", "admin")
-async def request_callback_handler(
-    update: Update, context: ContextTypes.DEFAULT_TYPE
-) -> None:
+def _with_status(original_text: str, status: str) -> str:
     """
-    Обрабатывает нажатия на inline-кнопки под сообщениями с заявками.
+    Возвращает текст сообщения с заявкой, в котором строка статуса заменена.
+
+    Строка статуса ищется с конца сообщения, поэтому остальной текст
+    не просматривается и не копируется по частям.
     """
-    query = update.callback_query
-    await query.answer()
+    header, sep, _ = original_text.rpartition(STATUS_PREFIX)
+    if not sep:
+        header = f"{original_text}\n\n"
+    return f"{header}{STATUS_PREFIX} {status}"
 
-    action, request_uuid = query.data.split(":", 1)
+
+async def _handle_accept(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, request_uuid: str
+) -> None:
+    """Принимает заявку в работу и меняет статус в сообщении."""
+    query = update.callback_query
     user = update.effective_user
     db_user = context.user_data["db_user"]
-
     google_api: GoogleAPIService = context.application.bot_data["google_api_service"]
 
-    if action == "accept_req":
-        success = await google_api.accept_request(
-            request_uuid=request_uuid, user_id=user.id, user_name=db_user.name
+    success = await google_api.accept_request(
+        request_uuid=request_uuid, user_id=user.id, user_name=db_user.name
+    )
+    if success:
+        new_text = _with_status(
+            query.message.text_html, f"🛠 В работе у {html.escape(db_user.name)}"
         )
-        if success:
-            original_text = query.message.text
-            new_text = original_text.replace(
-                "Статус: 🆕 Новый", f"Статус: 🛠 В работе у {db_user.name}"
-            )
-            keyboard = [
-                [
-                    InlineKeyboardButton(
-                        "✅ Готово", callback_data=f"complete_req:{request_uuid}"
-                    )
-                ]
+        keyboard = [
+            [
+                InlineKeyboardButton(
+                    "✅ Готово", callback_data=f"complete_req:{request_uuid}"
+                )
             ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            await query.edit_message_text(text=new_text, reply_markup=reply_markup)
-        else:
-            await query.answer(
-                "⚠️ Эту заявку уже взял в работу другой сотрудник.", show_alert=True
-            )
-
-    elif action == "complete_req":
-        success = await google_api.complete_request(
-            request_uuid=request_uuid, user_id=user.id
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
+        await query.edit_message_text(
+            text=new_text, parse_mode="HTML", reply_markup=reply_markup
+        )
+    else:
+        await query.answer(
+            "⚠️ Эту заявку уже взял в работу другой сотрудник.", show_alert=True
         )
-        if success:
-            original_text = query.message.text
-            # Удаляем старого исполнителя и добавляем нового
-            text_without_assignee = original_text.split("Статус:")[0]
-            new_text = text_without_assignee + f"Статус: ✅ Выполнено ({db_user.name})"
-            # Убираем клавиатуру после завершения
-            await query.edit_message_text(text=new_text, reply_markup=None)
-        else:
-            await query.answer(
-                "⚠️ Не удалось завершить заявку. Возможно, она уже завершена или вы не являетесь исполнителем.",
-                show_alert=True,
-            )
+
+
+async def _handle_complete(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, request_uuid: str
+) -> None:
+    """Завершает заявку и меняет статус в сообщении."""
+    query = update.callback_query
+    user = update.effective_user
+    db_user = context.user_data["db_user"]
+    google_api: GoogleAPIService = context.application.bot_data["google_api_service"]
+
+    success = await google_api.complete_request(
+        request_uuid=request_uuid, user_id=user.id
+    )
+    if success:
+        # Заменяем статус с исполнителем на итоговый
+        new_text = _with_status(
+            query.message.text_html, f"✅ Выполнено ({html.escape(db_user.name)})"
+        )
+        # Убираем клавиатуру после завершения
+        await query.edit_message_text(
+            text=new_text, parse_mode="HTML", reply_markup=None
+        )
+    else:
+        await query.answer(
+            "⚠️ Не удалось завершить заявку. Возможно, она уже завершена или вы не являетесь исполнителем.",
+            show_alert=True,
+        )
+
+
+# Обработчики callback-действий по префиксу callback_data
+_CALLBACK_HANDLERS: dict[
+    str,
+    Callable[[Update, ContextTypes.DEFAULT_TYPE, str], Coroutine[Any, Any, None]],
+] = {
+    "accept_req": _handle_accept,
+    "complete_req": _handle_complete,
+}
+
+
+@require_role("technician", "admin")
+async def request_callback_handler(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    """
+    Обрабатывает нажатия на inline-кнопки под сообщениями с заявками.
+    """
+    query = update.callback_query
+    await query.answer()
+
+    action, _, request_uuid = query.data.partition(":")
+    handler = _CALLBACK_HANDLERS.get(action)
+    if handler:
+        await handler(update, context, request_uuid)
@@ -6,10 +6,12 @@
 
 import logging
 
+from telegram import Update
 from telegram.ext import (
     Application,
     CallbackQueryHandler,
     CommandHandler,
+    ContextTypes,
     ConversationHandler,
     MessageHandler,
     filters,
@@ -20,28 +22,72 @@ from app.core.logging_config import setup_logging
 from app.handlers import admin, common
 from app.handlers import request as request_handler
 from app.services.google_api import GoogleAPIService
-from app.services.user_service import UserService
+from app.services.user_service import USER_CACHE_FILE, UserService
 
 logger = logging.getLogger(__name__)
 
 
+# Обработчики нажатий inline-кнопок по префиксу callback_data ("<действие>:<данные>")
+CALLBACK_ROUTES = {
+    "delete_user": admin.admin_user_callback,
+    "accept_req": request_handler.request_callback_handler,
+    "complete_req": request_handler.request_callback_handler,
+}
+
+
+async def route_callback_query(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    """Передает нажатие inline-кнопки обработчику из CALLBACK_ROUTES."""
+    query = update.callback_query
+    action, _, _ = (query.data or "").partition(":")
+    handler = CALLBACK_ROUTES.get(action)
+    if handler is None:
+        logger.warning("Received callback query with unknown action '%s'.", action)
+        await query.answer()
+        return
+    await handler(update, context)
+
+
+async def refresh_user_cache(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Периодически обновляет кэш пользователей в фоне."""
+    user_service: UserService = context.bot_data["user_service"]
+    await user_service.refresh()
+
+
 def main() -> None:
     """Основная функция для запуска бота."""
-    setup_logging()
+    log_listener = setup_logging()
 
     logger.info("Initializing services...")
     google_api_service = GoogleAPIService()
-    user_service = UserService(google_api=google_api_service)
+    user_service = UserService(
+        google_api=google_api_service, cache_file=USER_CACHE_FILE
+    )
 
     logger.info("Starting bot...")
-    application = Application.builder().token(settings.bot_token).build()
+    # HTTP/2 позволяет параллельным запросам к Bot API (например, рассылке
+    # уведомлений администраторам) идти по одному соединению. Пул соединений
+    # PTB по умолчанию (256) уже больше числа одновременных запросов бота
+    application = (
+        Application.builder().token(settings.bot_token).http_version("2").build()
+    )
 
     # Сохраняем экземпляры сервисов в bot_data для доступа из обработчиков
     application.bot_data["user_service"] = user_service
     application.bot_data["google_api_service"] = (
         google_api_service  # Добавьте эту строку
     )
-    application.bot_data["settings"] = settings
+    # Часто используемые значения кладем напрямую, чтобы обработчики
+    # получали их одним обращением к словарю
+    application.bot_data["admin_ids"] = settings.admin_ids
+    application.bot_data["issue_types_set"] = settings.issue_types_set
+
+    # Кэш пользователей заполняется сразу после запуска и затем обновляется
+    # в фоне, поэтому обработчики не ждут ответа Google Sheets
+    application.job_queue.run_repeating(
+        refresh_user_cache, interval=user_service.refresh_interval, first=0
+    )
 
     # --- Создаем ConversationHandler для создания заявки ---
     conv_handler = ConversationHandler(
@@ -68,15 +114,9 @@ def main() -> None:
     application.add_handler(conv_handler)
 
     application.add_handler(CommandHandler("start", common.start))
-    application.add_handler(
-        CallbackQueryHandler(admin.admin_user_callback, pattern=r"^delete_user:")
-    )
-    application.add_handler(
-        CallbackQueryHandler(
-            request_handler.request_callback_handler,
-            pattern=r"^(accept_req|complete_req):",
-        )
-    )
+    # Один обработчик для всех inline-кнопок: действие выбирается по словарю,
+    # без проверки регулярного выражения каждого обработчика
+    application.add_handler(CallbackQueryHandler(route_callback_query))
     application.add_handler(CommandHandler("myid", common.show_my_id))
     application.add_handler(CommandHandler("listusers", admin.list_users))
     application.add_handler(CommandHandler("adduser", admin.add_user))
@@ -90,7 +130,16 @@ def main() -> None:
     )
 
     logger.info("Bot is running in polling mode.")
-    application.run_polling()
+    try:
+        # Long polling: getUpdates ждет новые события до 30 секунд, а Telegram
+        # присылает только те типы обновлений, которые бот обрабатывает
+        application.run_polling(
+            timeout=30,
+            allowed_updates=[Update.MESSAGE, Update.CALLBACK_QUERY],
+        )
+    finally:
+        # Дописываем оставшиеся в очереди записи логов
+        log_listener.stop()
 
 
 if __name__ == "__main__":
@@ -6,7 +6,7 @@ import uuid
 from datetime import datetime, timezone
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 # Определяем возможные статусы заявки для строгой типизации
 RequestStatus = Literal["creating", "new", "in_progress", "completed", "cancelled"]
@@ -15,8 +15,12 @@ RequestStatus = Literal["creating", "new", "in_progress", "completed", "cancelle
 class MaintenanceRequest(BaseModel):
     """
     Модель заявки на техническое обслуживание.
+
+    Модель неизменяемая: изменения в ходе диалога делаются через model_copy().
     """
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     request_uuid: uuid.UUID = Field(default_factory=uuid.uuid4)
     status: RequestStatus = "new"
     location: str | None = None
@@ -31,5 +35,6 @@ class MaintenanceRequest(BaseModel):
     completed_at: datetime | None = None
 
     # Добавляем поле для хранения file_id фотографии в Telegram
-    # Оно не будет сохраняться в Google Sheets, но нужно для диалога
-    photo_file_id: str | None = None
+    # Оно не будет сохраняться в Google Sheets, но нужно для диалога,
+    # поэтому исключаем его из сериализации
+    photo_file_id: str | None = Field(default=None, exclude=True)
@@ -2,7 +2,19 @@
 Модели данных, связанные с пользователем.
 """
 
-from pydantic import BaseModel, Field
+import sys
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+
+def normalize_role(role: str) -> str:
+    """
+    Приводит роль к нижнему регистру и интернирует строку.
+
+    Роли проверяются при каждом обновлении от Telegram, а интернированные
+    строки сравниваются по ссылке, без посимвольного сравнения.
+    """
+    return sys.intern(role.strip().lower())
 
 
 class User(BaseModel):
@@ -13,8 +25,18 @@ class User(BaseModel):
         telegram_id (int): Уникальный идентификатор пользователя в Telegram.
         name (str): Имя пользователя (может быть username или first_name).
         role (str): Роль пользователя в системе (admin, housekeeper, etc.).
+
+    Модель неизменяемая: один и тот же объект из кэша UserService отдается
+    всем обработчикам, поэтому изменения делаются через model_copy().
     """
 
+    model_config = ConfigDict(frozen=True)
+
     telegram_id: int = Field(..., description="Telegram User ID")
     name: str = Field(..., description="User's name or username")
     role: str = Field(..., description="User's role in the system")
+
+    @field_validator("role")
+    @classmethod
+    def _normalize_role(cls, value: str) -> str:
+        return normalize_role(value)
@@ -3,20 +3,22 @@
 
 Реализует механизм повторных попыток (retry) для повышения отказоустойчивости
 и механизм блокировки (asyncio.Lock) для предотвращения состояния гонки.
+Синхронные вызовы gspread и Google API Client выполняются в пуле потоков,
+чтобы сетевые запросы не блокировали цикл событий бота.
 """
 
 import asyncio
-import io
 import logging
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Callable, TypeVar
 
 import gspread
 import requests.exceptions
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload
 from gspread.exceptions import APIError
+from gspread.utils import ValueInputOption, a1_to_rowcol
 from tenacity import (
     before_sleep_log,
     retry,
@@ -30,8 +32,13 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 CREDENTIALS_FILE = Path(__file__).parent.parent.parent / "credentials.json"
 
+# Сколько секунд считается актуальным индекс заявок (uuid -> строка, статус, исполнитель)
+REQUESTS_INDEX_TTL_SECONDS = 10
+
 
 def is_retryable_gspread_error(exception: BaseException) -> bool:
     return isinstance(exception, APIError) and exception.response.status_code >= 500
@@ -56,7 +63,7 @@ class GoogleAPIService:
     def __init__(self) -> None:
         logger.info("Initializing Google API client...")
         if not CREDENTIALS_FILE.exists():
-            logger.error(f"Credentials file not found at: {CREDENTIALS_FILE}")
+            logger.error("Credentials file not found at: %s", CREDENTIALS_FILE)
             raise FileNotFoundError(
                 f"Google credentials file not found at {CREDENTIALS_FILE}"
             )
@@ -69,116 +76,330 @@ class GoogleAPIService:
             filename=str(CREDENTIALS_FILE), scopes=self.scopes
         )
         self.lock = asyncio.Lock()
+        # ID таблицы не меняется во время работы, поэтому таблица и ее листы
+        # открываются один раз (каждое открытие — отдельный HTTP-запрос)
+        self._spreadsheet: gspread.Spreadsheet | None = None
+        self._worksheets: dict[str, gspread.Worksheet] = {}
+        # Заголовки листа заявок определяют порядок колонок при добавлении строки
+        self._requests_headers: list[str] | None = None
+        # uuid -> (номер строки, статус, assignee_id) и момент загрузки индекса
+        self._requests_index: dict[str, tuple[int, str, str]] | None = None
+        self._requests_index_loaded_at = 0.0
+        # Строки только что созданных заявок (uuid -> номер строки) из ответа
+        # append_row. Нужны до загрузки фото или отката, затем удаляются
+        self._pending_request_rows: dict[str, int] = {}
+        # Клиент Drive создается один раз; httplib2 под ним не потокобезопасен,
+        # поэтому обращения к Drive из разных потоков идут по очереди
+        self._drive_service = None
+        self._drive_lock = threading.Lock()
+        # Открыта ли папка для фото по ссылке (проверяется один раз)
+        self._drive_folder_is_public: bool | None = None
         logger.info("Google API client initialized successfully.")
 
     @google_api_retry
-    def get_users_worksheet(self) -> gspread.Worksheet:
-        """Открывает Google-таблицу и возвращает лист 'users'."""
+    def _get_worksheet(self, title: str) -> gspread.Worksheet:
+        """Возвращает лист таблицы по названию, открывая его при первом обращении."""
+        worksheet = self._worksheets.get(title)
+        if worksheet is not None:
+            return worksheet
         try:
-            spreadsheet = self.client.open_by_key(settings.google_sheet_id)
-            return spreadsheet.worksheet("users")
+            if self._spreadsheet is None:
+                self._spreadsheet = self.client.open_by_key(settings.google_sheet_id)
+            worksheet = self._spreadsheet.worksheet(title)
         except gspread.exceptions.SpreadsheetNotFound:
-            logger.error(f"Spreadsheet with ID '{settings.google_sheet_id}' not found.")
+            logger.error(
+                "Spreadsheet with ID '%s' not found.", settings.google_sheet_id
+            )
             raise
         except gspread.exceptions.WorksheetNotFound:
-            logger.error("Worksheet 'users' not found in the spreadsheet.")
+            logger.error("Worksheet '%s' not found in the spreadsheet.", title)
             raise
+        self._worksheets[title] = worksheet
+        return worksheet
+
+    @staticmethod
+    async def _run(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Выполняет блокирующий вызов Google API в отдельном потоке."""
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    def get_users_worksheet(self) -> gspread.Worksheet:
+        """Возвращает лист 'users'."""
+        return self._get_worksheet("users")
+
+    def get_requests_worksheet(self) -> gspread.Worksheet:
+        """Возвращает лист 'requests'."""
+        return self._get_worksheet("requests")
 
     @google_api_retry
     async def add_user(self, user_data: dict) -> None:
         """Добавляет нового пользователя в лист 'users'."""
-        logger.info(f"Adding user {user_data.get('telegram_id')} to Google Sheet.")
-        async with self.lock:
-            logger.debug(
-                f"Lock acquired for adding user {user_data.get('telegram_id')}."
-            )
-            try:
-                users_sheet = self.get_users_worksheet()
-                row_values = [
-                    user_data["telegram_id"],
-                    user_data["name"],
-                    user_data["role"],
-                ]
-                users_sheet.append_row(row_values)
-                logger.info(f"User {user_data.get('telegram_id')} added successfully.")
-            except Exception as e:
-                logger.error(f"Failed to add user to Google Sheet: {e}", exc_info=True)
-                raise
-        logger.debug(f"Lock released for adding user {user_data.get('telegram_id')}.")
+        logger.info("Adding user %s to Google Sheet.", user_data.get("telegram_id"))
+        # Блокировка не нужна: append_row добавляет строку атомарно на стороне API
+        try:
+            users_sheet = await self._run(self.get_users_worksheet)
+            row_values = [
+                user_data["telegram_id"],
+                user_data["name"],
+                user_data["role"],
+            ]
+            await self._run(users_sheet.append_row, row_values)
+            logger.info("User %s added successfully.", user_data.get("telegram_id"))
+        except Exception as e:
+            logger.error("Failed to add user to Google Sheet: %s", e, exc_info=True)
+            raise
 
     @google_api_retry
     async def delete_user(self, telegram_id: int) -> bool:
         """Удаляет пользователя из листа 'users'."""
-        logger.info(f"Attempting to delete user {telegram_id} from Google Sheet.")
+        logger.info("Attempting to delete user %s from Google Sheet.", telegram_id)
         async with self.lock:
-            logger.debug(f"Lock acquired for deleting user {telegram_id}.")
+            logger.debug("Lock acquired for deleting user %s.", telegram_id)
             try:
-                users_sheet = self.get_users_worksheet()
-                cell = users_sheet.find(str(telegram_id), in_column=1)
+                users_sheet = await self._run(self.get_users_worksheet)
+                cell = await self._run(users_sheet.find, str(telegram_id), in_column=1)
                 if cell:
-                    users_sheet.delete_rows(cell.row)
-                    logger.info(f"User {telegram_id} deleted successfully.")
+                    await self._run(users_sheet.delete_rows, cell.row)
+                    logger.info("User %s deleted successfully.", telegram_id)
                     return True
-                logger.warning(f"User {telegram_id} not found for deletion.")
+                logger.warning("User %s not found for deletion.", telegram_id)
                 return False
             except Exception as e:
                 logger.error(
-                    f"Failed to delete user from Google Sheet: {e}", exc_info=True
+                    "Failed to delete user from Google Sheet: %s", e, exc_info=True
                 )
                 raise
-        logger.debug(f"Lock released for deleting user {telegram_id}.")
+        logger.debug("Lock released for deleting user %s.", telegram_id)
 
     @google_api_retry
     async def update_user_name(self, telegram_id: int, new_name: str) -> bool:
         """Обновляет имя пользователя в листе 'users'."""
         logger.info(
-            f"Attempting to update name for user {telegram_id} to '{new_name}'."
+            "Attempting to update name for user %s to '%s'.", telegram_id, new_name
         )
         async with self.lock:
-            logger.debug(f"Lock acquired for updating name for user {telegram_id}.")
+            logger.debug("Lock acquired for updating name for user %s.", telegram_id)
             try:
-                users_sheet = self.get_users_worksheet()
-                cell = users_sheet.find(str(telegram_id), in_column=1)
+                users_sheet = await self._run(self.get_users_worksheet)
+                cell = await self._run(users_sheet.find, str(telegram_id), in_column=1)
                 if cell:
-                    users_sheet.update_cell(cell.row, 2, new_name)
-                    logger.info(f"Name for user {telegram_id} updated successfully.")
+                    await self._run(users_sheet.update_cell, cell.row, 2, new_name)
+                    logger.info("Name for user %s updated successfully.", telegram_id)
                     return True
-                logger.warning(f"User {telegram_id} not found for name update.")
+                logger.warning("User %s not found for name update.", telegram_id)
                 return False
             except Exception as e:
                 logger.error(
-                    f"Failed to update user name in Google Sheet: {e}", exc_info=True
+                    "Failed to update user name in Google Sheet: %s", e, exc_info=True
                 )
                 raise
-        logger.debug(f"Lock released for updating name for user {telegram_id}.")
+        logger.debug("Lock released for updating name for user %s.", telegram_id)
 
     # --- Методы для работы с заявками ---
 
-    @google_api_retry
-    async def upload_photo_to_drive(
-        self, file_id: str, file_name: str, bot
-    ) -> str | None:
-        """Скачивает файл из Telegram и загружает его в Google Drive."""
-        logger.info(f"Uploading photo with file_id {file_id} to Google Drive.")
+    @staticmethod
+    def _batch_update_row(
+        worksheet: gspread.Worksheet, values_by_range: dict[str, list]
+    ) -> None:
+        """
+        Записывает значения в несколько диапазонов одной строки одним запросом.
+
+        Значения интерпретируются так же, как при ручном вводе (USER_ENTERED),
+        как это делал update_cell.
+        """
+        worksheet.batch_update(
+            [
+                {"range": range_name, "values": [row_values]}
+                for range_name, row_values in values_by_range.items()
+            ],
+            value_input_option=ValueInputOption.user_entered,
+        )
+
+    def _is_requests_index_fresh(self) -> bool:
+        return (
+            self._requests_index is not None
+            and time.monotonic() - self._requests_index_loaded_at
+            < REQUESTS_INDEX_TTL_SECONDS
+        )
+
+    def _load_requests_index(
+        self, requests_sheet: gspread.Worksheet
+    ) -> dict[str, tuple[int, str, str]]:
+        """
+        Возвращает индекс заявок {uuid: (строка, статус, assignee_id)}.
+
+        Колонки A, B и I читаются одним запросом batchGet вместо find() и
+        отдельных чтений ячеек. Индекс кэшируется на REQUESTS_INDEX_TTL_SECONDS
+        и сбрасывается после каждой записи в лист заявок.
+        """
+        if self._is_requests_index_fresh():
+            return self._requests_index
+
+        now = time.monotonic()
+
+        uuids, statuses, assignee_ids = requests_sheet.batch_get(
+            ["A2:A", "B2:B", "I2:I"]
+        )
+
+        def value_at(column: list[list[str]], index: int) -> str:
+            # API не возвращает пустые ячейки в конце столбца и в конце строки
+            if index < len(column) and column[index]:
+                return column[index][0]
+            return ""
+
+        index: dict[str, tuple[int, str, str]] = {}
+        for i, uuid_row in enumerate(uuids):
+            if uuid_row and uuid_row[0]:
+                index[uuid_row[0]] = (
+                    i + 2,
+                    value_at(statuses, i),
+                    value_at(assignee_ids, i),
+                )
+
+        self._requests_index = index
+        self._requests_index_loaded_at = now
+        return index
+
+    def _invalidate_requests_index(self) -> None:
+        """Сбрасывает кэш индекса заявок после изменения листа."""
+        self._requests_index = None
+
+    async def _get_request_for_update(
+        self, requests_sheet: gspread.Worksheet, request_uuid: str, expected_status: str
+    ) -> tuple[int, str, str] | None:
+        """
+        Возвращает (строка, статус, assignee_id) заявки для проверки перед записью.
+
+        Строка заявки берется из индекса. Если по индексу заявка не в ожидаемом
+        статусе, отказ возвращается сразу. Иначе строка перечитывается одним
+        запросом: индекс мог устареть (статус изменили вне бота или строки
+        сдвинулись), а писать по устаревшим данным нельзя. Если заявки нет
+        в закэшированном индексе или она сдвинулась, индекс один раз
+        перечитывается: он мог быть загружен до создания заявки.
+        """
+        for attempt in range(2):
+            from_cache = self._is_requests_index_fresh()
+            index = await self._run(self._load_requests_index, requests_sheet)
+            entry = index.get(request_uuid)
+            if entry is None and not from_cache:
+                return None
+            if entry is not None and entry[1] != expected_status:
+                return entry
+
+            if entry is not None:
+                row = entry[0]
+                values = await self._run(requests_sheet.get, f"A{row}:I{row}")
+                # Пустые ячейки в конце строки API не возвращает: дополняем до A:I
+                cells = [*(values[0] if values else []), *[""] * 9][:9]
+                if cells[0] == request_uuid:
+                    return row, cells[1], cells[8]
+
+            if attempt == 0:
+                # Индекс устарел: заявку создали после его загрузки
+                # или строки сдвинулись
+                logger.info(
+                    "Request %s not found at indexed row, reloading requests index.",
+                    request_uuid,
+                )
+                self._invalidate_requests_index()
+        return None
+
+    @staticmethod
+    def _row_from_append_response(response: dict) -> int | None:
+        """Возвращает номер добавленной строки из ответа append_row."""
         try:
-            tg_file = await bot.get_file(file_id)
-            file_content = io.BytesIO()
-            await tg_file.download_to_memory(file_content)
-            file_content.seek(0)
+            updated_range = response["updates"]["updatedRange"]  # 'requests'!A5:L5
+        except (KeyError, TypeError):
+            return None
+        first_cell = updated_range.rpartition("!")[2].partition(":")[0]
+        return a1_to_rowcol(first_cell)[0]
+
+    async def _find_request_row(
+        self, requests_sheet: gspread.Worksheet, request_uuid: str
+    ) -> int | None:
+        """
+        Находит строку заявки: сначала среди только что созданных, затем find().
+
+        Строка из ответа append_row могла устареть (откат другой заявки,
+        сортировка или удаление строк вручную), поэтому перед использованием
+        проверяется, что в ней по-прежнему эта заявка.
+        """
+        row = self._pending_request_rows.get(request_uuid)
+        if row is not None:
+            values = await self._run(requests_sheet.get, f"A{row}")
+            if values and values[0] and values[0][0] == request_uuid:
+                return row
+            logger.info(
+                "Request %s is no longer in row %s, searching the sheet.",
+                request_uuid,
+                row,
+            )
+            self._pending_request_rows.pop(request_uuid, None)
+        cell = await self._run(requests_sheet.find, request_uuid, in_column=1)
+        return cell.row if cell else None
+
+    def _get_drive_service(self):
+        """Возвращает клиент Google Drive, создавая его при первом обращении."""
+        if self._drive_service is None:
+            # Клиент Drive нужен только для загрузки фото, поэтому его тяжелые
+            # модули импортируются при первой загрузке, а не при старте бота
+            from google.oauth2.service_account import Credentials
+            from googleapiclient.discovery import build
 
             creds = Credentials.from_service_account_file(
                 CREDENTIALS_FILE, scopes=self.scopes
             )
-            drive_service = build("drive", "v3", credentials=creds)
-
-            file_metadata = {
-                "name": file_name,
-                "parents": [settings.google_drive_folder_id],
-            }
-            media = MediaIoBaseUpload(
-                file_content, mimetype="image/jpeg", resumable=True
+            self._drive_service = build("drive", "v3", credentials=creds)
+        return self._drive_service
+
+    def _is_drive_folder_public(self, drive_service) -> bool:
+        """
+        Проверяет, открыт ли доступ по ссылке ко всей папке для фото.
+
+        Файлы наследуют разрешения папки, поэтому в этом случае отдельное
+        разрешение на каждый загруженный файл не нужно. Результат кэшируется.
+        """
+        if self._drive_folder_is_public is None:
+            try:
+                response = (
+                    drive_service.permissions()
+                    .list(
+                        fileId=settings.google_drive_folder_id,
+                        fields="permissions(type,role)",
+                    )
+                    .execute()
+                )
+                self._drive_folder_is_public = any(
+                    permission.get("type") == "anyone"
+                    for permission in response.get("permissions", [])
+                )
+            except Exception as e:
+                # Без прав на чтение разрешений папки выдаем доступ к каждому файлу
+                logger.warning("Could not read Drive folder permissions: %s", e)
+                self._drive_folder_is_public = False
+            logger.info(
+                "Drive folder is public: %s. Per-file permissions %s.",
+                self._drive_folder_is_public,
+                "skipped" if self._drive_folder_is_public else "required",
             )
+        return self._drive_folder_is_public
 
+    def _upload_to_drive(
+        self, file_content: bytes | bytearray, file_name: str
+    ) -> str | None:
+        """Загружает файл в Google Drive и открывает доступ по ссылке."""
+        from googleapiclient.http import MediaInMemoryUpload
+
+        file_metadata = {
+            "name": file_name,
+            "parents": [settings.google_drive_folder_id],
+        }
+        # Фото из Telegram небольшие, поэтому загружаем их одним запросом
+        media = MediaInMemoryUpload(
+            file_content, mimetype="image/jpeg", resumable=False
+        )
+
+        with self._drive_lock:
+            drive_service = self._get_drive_service()
             file = (
                 drive_service.files()
                 .create(body=file_metadata, media_body=media, fields="id,webViewLink")
@@ -186,77 +407,144 @@ class GoogleAPIService:
             )
 
             file_id = file.get("id")
-            drive_service.permissions().create(
-                fileId=file_id, body={"type": "anyone", "role": "reader"}
-            ).execute()
+            # Batch-запрос здесь не поможет: он не поддерживает загрузку файлов,
+            # а разрешению нужен ID уже созданного файла
+            if not self._is_drive_folder_public(drive_service):
+                drive_service.permissions().create(
+                    fileId=file_id, body={"type": "anyone", "role": "reader"}
+                ).execute()
+
+        logger.info("Photo uploaded successfully. Drive file ID: %s", file_id)
+        return file.get("webViewLink")
 
-            logger.info(f"Photo uploaded successfully. Drive file ID: {file_id}")
-            return file.get("webViewLink")
+    @google_api_retry
+    async def upload_photo_to_drive(
+        self, file_id: str, file_name: str, bot
+    ) -> str | None:
+        """Скачивает файл из Telegram и загружает его в Google Drive."""
+        logger.info("Uploading photo with file_id %s to Google Drive.", file_id)
+        try:
+            tg_file = await bot.get_file(file_id)
+            file_content = await tg_file.download_as_bytearray()
+            return await self._run(self._upload_to_drive, file_content, file_name)
         except Exception as e:
-            logger.error(f"Failed to upload photo to Google Drive: {e}", exc_info=True)
+            logger.error("Failed to upload photo to Google Drive: %s", e, exc_info=True)
             return None
 
+    def _delete_from_drive(self, file_name: str) -> int:
+        """Удаляет из папки для фото файлы с указанным именем."""
+        query = (
+            f"name = '{file_name}' and "
+            f"'{settings.google_drive_folder_id}' in parents and trashed = false"
+        )
+        with self._drive_lock:
+            drive_service = self._get_drive_service()
+            response = drive_service.files().list(q=query, fields="files(id)").execute()
+            files = response.get("files", [])
+            for file in files:
+                drive_service.files().delete(fileId=file["id"]).execute()
+        return len(files)
+
+    async def delete_photo_from_drive(self, file_name: str) -> bool:
+        """Удаляет загруженное фото из Google Drive. Используется для отката."""
+        logger.warning(
+            "Rolling back photo upload. Deleting %s from Google Drive.", file_name
+        )
+        try:
+            deleted = await self._run(self._delete_from_drive, file_name)
+        except Exception as e:
+            logger.error(
+                "Failed to delete photo from Google Drive: %s", e, exc_info=True
+            )
+            return False
+        logger.info(
+            "Deleted %s file(s) named %s from Google Drive.", deleted, file_name
+        )
+        return deleted > 0
+
     @google_api_retry
     async def create_request_row(self, request_data: dict) -> None:
         """Создает новую строку для заявки в Google Sheets."""
         logger.info(
-            f"Creating initial request row for UUID {request_data.get('request_uuid')}"
+            "Creating initial request row for UUID %s", request_data.get("request_uuid")
         )
-        async with self.lock:
-            try:
-                requests_sheet = self.client.open_by_key(
-                    settings.google_sheet_id
-                ).worksheet("requests")
-                headers = requests_sheet.row_values(1)
-                row_values = [request_data.get(header) for header in headers]
-                requests_sheet.append_row(row_values)
-                logger.info("Initial request row created successfully.")
-            except Exception as e:
-                logger.error(f"Failed to create request row: {e}", exc_info=True)
-                raise
+        # Добавление строки не сдвигает существующие, поэтому выполняется без
+        # блокировки; под ней только запоминается номер строки, который
+        # сдвигает откат других заявок
+        try:
+            requests_sheet = await self._run(self.get_requests_worksheet)
+            if self._requests_headers is None:
+                self._requests_headers = await self._run(requests_sheet.row_values, 1)
+            row_values = [request_data.get(header) for header in self._requests_headers]
+            response = await self._run(requests_sheet.append_row, row_values)
+            self._invalidate_requests_index()
+            row = self._row_from_append_response(response)
+            # Номер строки нужен только черновику заявки с фото: его затем
+            # обновят или удалят при откате. Готовые заявки (без фото) больше
+            # не меняются по номеру строки, и запоминать их не нужно
+            if row is not None and request_data.get("status") == "creating":
+                async with self.lock:
+                    self._pending_request_rows[str(request_data["request_uuid"])] = row
+            logger.info("Initial request row created successfully.")
+        except APIError as e:
+            # Заголовки перечитаем при следующей попытке: лист мог измениться
+            self._requests_headers = None
+            logger.error("Failed to create request row: %s", e, exc_info=True)
+            raise
+        except Exception as e:
+            logger.error("Failed to create request row: %s", e, exc_info=True)
+            raise
 
     @google_api_retry
     async def update_request_after_upload(
         self, request_uuid: str, photo_url: str
     ) -> None:
         """Обновляет статус заявки и добавляет ссылку на фото."""
-        logger.info(f"Updating request row for UUID {request_uuid} with photo URL.")
+        logger.info("Updating request row for UUID %s with photo URL.", request_uuid)
         async with self.lock:
             try:
-                requests_sheet = self.client.open_by_key(
-                    settings.google_sheet_id
-                ).worksheet("requests")
-                cell = requests_sheet.find(request_uuid, in_column=1)
-                if cell:
-                    requests_sheet.update_cell(cell.row, 2, "new")
-                    requests_sheet.update_cell(cell.row, 5, photo_url)
-                    logger.info(f"Request {request_uuid} updated successfully.")
+                requests_sheet = await self._run(self.get_requests_worksheet)
+                row = await self._find_request_row(requests_sheet, request_uuid)
+                if row is not None:
+                    await self._run(
+                        self._batch_update_row,
+                        requests_sheet,
+                        {f"B{row}": ["new"], f"E{row}": [photo_url]},
+                    )
+                    self._pending_request_rows.pop(request_uuid, None)
+                    self._invalidate_requests_index()
+                    logger.info("Request %s updated successfully.", request_uuid)
             except Exception as e:
-                logger.error(f"Failed to update request row: {e}", exc_info=True)
+                logger.error("Failed to update request row: %s", e, exc_info=True)
                 raise
 
     @google_api_retry
     async def delete_request_by_uuid(self, request_uuid: str) -> bool:
         """Удаляет строку заявки по её UUID. Используется для отката транзакции."""
         logger.warning(
-            f"Rolling back transaction. Deleting request row for UUID {request_uuid}."
+            "Rolling back transaction. Deleting request row for UUID %s.", request_uuid
         )
         async with self.lock:
             try:
-                requests_sheet = self.client.open_by_key(
-                    settings.google_sheet_id
-                ).worksheet("requests")
-                cell = requests_sheet.find(request_uuid, in_column=1)
-                if cell:
-                    requests_sheet.delete_rows(cell.row)
+                requests_sheet = await self._run(self.get_requests_worksheet)
+                row = await self._find_request_row(requests_sheet, request_uuid)
+                if row is not None:
+                    await self._run(requests_sheet.delete_rows, row)
+                    self._pending_request_rows.pop(request_uuid, None)
+                    # Строки ниже удаленной сдвигаются вверх
+                    for pending_uuid, pending_row in self._pending_request_rows.items():
+                        if pending_row > row:
+                            self._pending_request_rows[pending_uuid] = pending_row - 1
+                    self._invalidate_requests_index()
                     logger.info(
-                        f"Request row {request_uuid} deleted successfully during rollback."
+                        "Request row %s deleted successfully during rollback.",
+                        request_uuid,
                     )
                     return True
                 return False
             except Exception as e:
                 logger.error(
-                    f"Failed to delete request row during rollback: {e}", exc_info=True
+                    "Failed to delete request row during rollback: %s", e, exc_info=True
                 )
                 return False
 
@@ -268,40 +556,48 @@ class GoogleAPIService:
         Принимает заявку в работу: обновляет статус, исполнителя и время принятия.
         """
         logger.info(
-            f"Accepting request {request_uuid} by user {user_id} ({user_name})."
+            "Accepting request %s by user %s (%s).", request_uuid, user_id, user_name
         )
         async with self.lock:
             try:
-                requests_sheet = self.client.open_by_key(
-                    settings.google_sheet_id
-                ).worksheet("requests")
-                cell = requests_sheet.find(request_uuid, in_column=1)
-                if not cell:
-                    logger.warning(f"Request {request_uuid} not found to be accepted.")
+                requests_sheet = await self._run(self.get_requests_worksheet)
+                entry = await self._get_request_for_update(
+                    requests_sheet, request_uuid, expected_status="new"
+                )
+                if entry is None:
+                    logger.warning("Request %s not found to be accepted.", request_uuid)
                     return False
+                row, current_status, _ = entry
 
                 # Проверяем, не принята ли заявка уже кем-то другим
-                current_status = requests_sheet.cell(cell.row, 2).value
                 if current_status != "new":
                     logger.warning(
-                        f"User {user_id} tried to accept request {request_uuid}, "
-                        f"but it already has status '{current_status}'."
+                        "User %s tried to accept request %s, "
+                        "but it already has status '%s'.",
+                        user_id,
+                        request_uuid,
+                        current_status,
                     )
                     return False
 
-                # Обновляем ячейки
-                requests_sheet.update_cell(cell.row, 2, "in_progress")  # status
-                requests_sheet.update_cell(cell.row, 9, user_id)  # assignee_id
-                requests_sheet.update_cell(cell.row, 10, user_name)  # assignee_name
-                requests_sheet.update_cell(
-                    cell.row, 11, datetime.now(timezone.utc).isoformat()
-                )  # accepted_at)  # accepted_at
+                # Обновляем ячейки одним запросом:
+                # status (B) и assignee_id, assignee_name, accepted_at (I:K)
+                accepted_at = datetime.now(timezone.utc).isoformat()
+                await self._run(
+                    self._batch_update_row,
+                    requests_sheet,
+                    {
+                        f"B{row}": ["in_progress"],
+                        f"I{row}:K{row}": [user_id, user_name, accepted_at],
+                    },
+                )
+                self._invalidate_requests_index()
 
-                logger.info(f"Request {request_uuid} accepted successfully.")
+                logger.info("Request %s accepted successfully.", request_uuid)
                 return True
             except Exception as e:
                 logger.error(
-                    f"Failed to accept request {request_uuid}: {e}", exc_info=True
+                    "Failed to accept request %s: %s", request_uuid, e, exc_info=True
                 )
                 raise
 
@@ -310,45 +606,53 @@ class GoogleAPIService:
         """
         Завершает заявку: обновляет статус и время завершения.
         """
-        logger.info(f"Completing request {request_uuid} by user {user_id}.")
+        logger.info("Completing request %s by user %s.", request_uuid, user_id)
         async with self.lock:
             try:
-                requests_sheet = self.client.open_by_key(
-                    settings.google_sheet_id
-                ).worksheet("requests")
-                cell = requests_sheet.find(request_uuid, in_column=1)
-                if not cell:
-                    logger.warning(f"Request {request_uuid} not found to be completed.")
+                requests_sheet = await self._run(self.get_requests_worksheet)
+                entry = await self._get_request_for_update(
+                    requests_sheet, request_uuid, expected_status="in_progress"
+                )
+                if entry is None:
+                    logger.warning(
+                        "Request %s not found to be completed.", request_uuid
+                    )
                     return False
+                row, current_status, assignee_id = entry
 
                 # Проверяем, что заявка находится в работе и что ее завершает тот же сотрудник
-                current_status = requests_sheet.cell(cell.row, 2).value
-                assignee_id = int(requests_sheet.cell(cell.row, 9).value)
-
                 if current_status != "in_progress":
                     logger.warning(
-                        f"User {user_id} tried to complete request {request_uuid}, "
-                        f"but it has status '{current_status}'."
+                        "User %s tried to complete request %s, but it has status '%s'.",
+                        user_id,
+                        request_uuid,
+                        current_status,
                     )
                     return False  # Нельзя завершить то, что не в работе
 
-                if assignee_id != user_id:
+                if assignee_id != str(user_id):
                     logger.warning(
-                        f"User {user_id} tried to complete request {request_uuid}, "
-                        f"but it is assigned to user {assignee_id}."
+                        "User %s tried to complete request %s, "
+                        "but it is assigned to user %s.",
+                        user_id,
+                        request_uuid,
+                        assignee_id,
                     )
                     return False  # Завершить может только тот, кто принял
 
-                # Обновляем ячейки
-                requests_sheet.update_cell(cell.row, 2, "completed")  # status
-                requests_sheet.update_cell(
-                    cell.row, 12, datetime.now(timezone.utc).isoformat()
-                )  # completed_at
+                # Обновляем ячейки одним запросом: status (B) и completed_at (L)
+                completed_at = datetime.now(timezone.utc).isoformat()
+                await self._run(
+                    self._batch_update_row,
+                    requests_sheet,
+                    {f"B{row}": ["completed"], f"L{row}": [completed_at]},
+                )
+                self._invalidate_requests_index()
 
-                logger.info(f"Request {request_uuid} completed successfully.")
+                logger.info("Request %s completed successfully.", request_uuid)
                 return True
             except Exception as e:
                 logger.error(
-                    f"Failed to complete request {request_uuid}: {e}", exc_info=True
+                    "Failed to complete request %s: %s", request_uuid, e, exc_info=True
                 )
                 raise
@@ -2,10 +2,11 @@
 Сервис для отправки уведомлений пользователям и в чаты.
 """
 
+import html
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
 
-import pytz
 from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.constants import ParseMode
 
@@ -14,6 +15,20 @@ from app.models.request import MaintenanceRequest
 
 logger = logging.getLogger(__name__)
 
+# Часовой пояс для отображения дат создается один раз при импорте модуля
+DISPLAY_TZ = ZoneInfo(settings.display_timezone)
+
+# Шаблон уведомления о новой заявке (HTML). Поля, введенные пользователями,
+# подставляются экранированными
+NEW_REQUEST_TEMPLATE = (
+    "🚨 <b>Новая заявка: #{short_uuid}</b> 🚨\n\n"
+    "📍 <b>Локация:</b> {location}\n"
+    "🔧 <b>Тип поломки:</b> {issue_type}\n"
+    "👤 <b>Заявитель:</b> {reporter_name}\n"
+    "🕓 <b>Создана:</b> {created_at}\n\n"
+    "Статус: 🆕 Новый"
+)
+
 
 def _format_datetime(dt: datetime | None) -> str:
     """
@@ -24,11 +39,10 @@ def _format_datetime(dt: datetime | None) -> str:
 
     # Убеждаемся, что время в UTC, если оно "наивное"
     if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=pytz.utc)
+        dt = dt.replace(tzinfo=timezone.utc)
 
     # Конвертируем в целевой часовой пояс
-    display_tz = pytz.timezone(settings.display_timezone)
-    local_dt = dt.astimezone(display_tz)
+    local_dt = dt.astimezone(DISPLAY_TZ)
 
     return local_dt.strftime("%d.%m.%Y в %H:%M")
 
@@ -41,14 +55,12 @@ class NotificationService:
         """
         Отправляет уведомление о новой заявке в чат техслужбы.
         """
-        created_at_str = _format_datetime(request.created_at)
-        text = (
-            f"🚨 **Новая заявка: #{str(request.request_uuid)[:8]}** 🚨\n\n"
-            f"📍 **Локация:** {request.location}\n"
-            f"🔧 **Тип поломки:** {request.issue_type}\n"
-            f"👤 **Заявитель:** {request.reporter_name}\n"
-            f"🕓 **Создана:** {created_at_str}\n\n"
-            f"Статус: 🆕 Новый"
+        text = NEW_REQUEST_TEMPLATE.format(
+            short_uuid=str(request.request_uuid)[:8],
+            location=html.escape(request.location or ""),
+            issue_type=html.escape(request.issue_type or ""),
+            reporter_name=html.escape(request.reporter_name),
+            created_at=_format_datetime(request.created_at),
         )
 
         keyboard = [
@@ -72,10 +84,15 @@ class NotificationService:
                 reply_markup=reply_markup,
             )
             logger.info(
-                f"Sent new request notification for {request.request_uuid} to chat {chat_id}."
+                "Sent new request notification for %s to chat %s.",
+                request.request_uuid,
+                chat_id,
             )
         except Exception as e:
             logger.error(
-                f"Failed to send notification for {request.request_uuid} to chat {chat_id}: {e}",
+                "Failed to send notification for %s to chat %s: %s",
+                request.request_uuid,
+                chat_id,
+                e,
                 exc_info=True,
             )
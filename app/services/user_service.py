@@ -5,80 +5,273 @@
 а также кэширование для повышения производительности и отказоустойчивости.
 """
 
+import asyncio
 import logging
+import threading
 import time
+import weakref
+from pathlib import Path
 from typing import Optional
 
-from app.models.user import User
+from pydantic import TypeAdapter, ValidationError
+
+from app.models.user import User, normalize_role
 from app.services.google_api import GoogleAPIService
 
 logger = logging.getLogger(__name__)
 
+# Снимок кэша пользователей на диске: после перезапуска бот сразу авторизует
+# пользователей, не дожидаясь ответа Google Sheets
+USER_CACHE_FILE = Path(__file__).parent.parent.parent / "users_cache.json"
+
+_USERS_ADAPTER = TypeAdapter(list[User])
+
 
 class UserService:
     """
     Сервис для работы с данными пользователей.
+
+    Список пользователей меняется редко и только через команды бота, которые
+    сами вносят изменения в кэш, поэтому кэш живет долго и периодически
+    обновляется в фоне (см. refresh), не заставляя обработчики ждать Google Sheets.
+    Кэш старше TTL, но младше stale_ttl_seconds, отдается сразу, а обновление
+    запускается в фоне (stale-while-revalidate).
     """
 
-    def __init__(self, google_api: GoogleAPIService, cache_ttl_seconds: int = 60):
+    def __init__(
+        self,
+        google_api: GoogleAPIService,
+        cache_ttl_seconds: int = 3600,
+        stale_ttl_seconds: int = 86400,
+        cache_file: Path | None = None,
+    ):
         self.google_api = google_api
+        self._cache_file = cache_file
+        self._snapshot_lock = threading.Lock()
         self._cache_ttl = cache_ttl_seconds
+        self._stale_ttl = max(stale_ttl_seconds, cache_ttl_seconds)
         self._user_cache: list[User] | None = None
-        self._cache_timestamp: float = 0.0
+        # Время загрузки кэша по монотонным часам: переводы системного времени
+        # (NTP, ручная настройка) не продлевают и не сокращают TTL
+        self._cache_monotonic: float = float("-inf")
+        # Индекс кэша по telegram_id для поиска пользователя за O(1)
+        self._user_index: dict[int, User] = {}
+        # Увеличивается при каждом изменении кэша командами бота, чтобы чтение
+        # таблицы, начатое до изменения, не записало в кэш устаревшие данные
+        self._cache_generation = 0
+        # Одновременные промахи кэша ждут одного чтения таблицы, а не делают свои.
+        # asyncio.Lock привязан к циклу событий, поэтому у каждого цикла своя
+        # блокировка (сервис может использоваться из нескольких циклов/потоков)
+        self._fetch_locks: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Lock
+        ] = weakref.WeakKeyDictionary()
+        self._fetch_locks_guard = threading.Lock()
+        # Ссылка на фоновое обновление: не дает задаче пропасть до завершения
+        # и не позволяет запустить второе обновление, пока идет первое
+        self._refresh_task: asyncio.Task | None = None
+        self._load_snapshot()
+
+    def _get_fetch_lock(self) -> asyncio.Lock:
+        """Возвращает блокировку чтения таблицы для текущего цикла событий."""
+        loop = asyncio.get_running_loop()
+        with self._fetch_locks_guard:
+            lock = self._fetch_locks.get(loop)
+            if lock is None:
+                lock = self._fetch_locks[loop] = asyncio.Lock()
+            return lock
+
+    @property
+    def refresh_interval(self) -> float:
+        """Интервал фонового обновления кэша: половина TTL."""
+        return self._cache_ttl / 2
+
+    def _fetch_users(self) -> list[User]:
+        """Читает список пользователей из Google-таблицы."""
+        users_sheet = self.google_api.get_users_worksheet()
+        # Колонки листа: telegram_id, name, role. Читаем значения без строки
+        # заголовков и собираем модели по позиции: данные таблицы доверенные,
+        # поэтому валидация pydantic для каждой строки не нужна
+        rows = users_sheet.get_values("A2:C")
+        return [
+            User.model_construct(
+                telegram_id=int(row[0]), name=row[1], role=normalize_role(row[2])
+            )
+            for row in rows
+            if len(row) >= 3 and row[0]
+        ]
+
+    def _save_snapshot(self) -> None:
+        """
+        Сохраняет текущий кэш пользователей на диск.
+
+        Список берется в момент записи под блокировкой, поэтому при нескольких
+        сохранениях подряд последним на диск попадает актуальный кэш.
+        """
+        # Пишем во временный файл и подменяем: прерванная запись не испортит снимок
+        tmp_file = self._cache_file.with_suffix(".tmp")
+        with self._snapshot_lock:
+            try:
+                tmp_file.write_bytes(_USERS_ADAPTER.dump_json(self._user_cache))
+                tmp_file.replace(self._cache_file)
+            except OSError as e:
+                logger.warning("Failed to save user cache snapshot: %s", e)
+
+    async def _persist_snapshot(self) -> None:
+        """Сохраняет снимок кэша в отдельном потоке, если задан файл снимка."""
+        if self._cache_file is not None and self._user_cache is not None:
+            await asyncio.to_thread(self._save_snapshot)
+
+    def _load_snapshot(self) -> None:
+        """
+        Заполняет кэш из снимка на диске, если он не старше stale_ttl_seconds.
+
+        Снимок считается устаревшим: он сразу отдается обработчикам, а таблица
+        перечитывается в фоне.
+        """
+        if self._cache_file is None:
+            return
+        try:
+            # Снимок пережил перезапуск, поэтому возраст считаем по системному времени
+            age = time.time() - self._cache_file.stat().st_mtime
+            if age >= self._stale_ttl:
+                logger.info("User cache snapshot is too old, ignoring it.")
+                return
+            users = _USERS_ADAPTER.validate_json(self._cache_file.read_bytes())
+        except FileNotFoundError:
+            return
+        except (OSError, ValidationError) as e:
+            logger.warning("Failed to load user cache snapshot: %s", e)
+            return
+        self._store_users(users, time.monotonic() - self._cache_ttl)
+        logger.info("Loaded %s users from cache snapshot.", len(users))
+
+    def _store_users(self, users: list[User], loaded_at: float) -> None:
+        self._user_cache = users
+        self._user_index = {user.telegram_id: user for user in users}
+        self._cache_monotonic = loaded_at
 
-    def get_all_users(self) -> list[User]:
-        current_time = time.time()
-        if (
+    async def _patch_cache(self, users: list[User]) -> None:
+        """
+        Заменяет список в кэше после изменения таблицы командой бота.
+
+        Изменение известно, поэтому кэш не сбрасывается и не перечитывается,
+        а время его загрузки (и отсчет TTL) остается прежним. Снимок на диске
+        обновляется сразу, чтобы после перезапуска изменение не потерялось.
+        """
+        self._user_cache = users
+        self._cache_generation += 1
+        await self._persist_snapshot()
+
+    def _is_cache_fresh(self) -> bool:
+        return (
             self._user_cache is not None
-            and (current_time - self._cache_timestamp) < self._cache_ttl
-        ):
-            logger.debug("Returning users from cache.")
-            return self._user_cache
+            and (time.monotonic() - self._cache_monotonic) < self._cache_ttl
+        )
+
+    def _schedule_refresh(self) -> None:
+        """Запускает фоновое обновление кэша, если оно еще не идет."""
+        if self._refresh_task is None or self._refresh_task.done():
+            logger.debug("User cache is stale, refreshing in background.")
+            self._refresh_task = asyncio.create_task(self.refresh())
+
+    async def get_all_users(self) -> list[User]:
+        if self._user_cache is not None:
+            age = time.monotonic() - self._cache_monotonic
+            if age < self._cache_ttl:
+                logger.debug("Returning users from cache.")
+                return self._user_cache
+            if age < self._stale_ttl:
+                self._schedule_refresh()
+                return self._user_cache
+
+        async with self._get_fetch_lock():
+            # Пока ждали блокировку, кэш мог обновить другой обработчик
+            if self._is_cache_fresh():
+                logger.debug("Returning users from cache.")
+                return self._user_cache
+            return await self._load_users()
 
+    async def _load_users(self) -> list[User]:
+        """Читает пользователей в отдельном потоке и обновляет кэш."""
         logger.info("Cache is expired or empty. Fetching users from Google Sheet...")
+        generation = self._cache_generation
+        loaded_at = time.monotonic()
         try:
-            users_sheet = self.google_api.get_users_worksheet()
-            records = users_sheet.get_all_records()
-            self._user_cache = [User(**record) for record in records]
-            self._cache_timestamp = current_time
-            logger.info(
-                f"Successfully fetched and cached {len(self._user_cache)} users."
-            )
-            return self._user_cache
+            users = await asyncio.to_thread(self._fetch_users)
+            if generation != self._cache_generation:
+                # Таблицу изменили во время чтения: данные могут не включать
+                # изменение, поэтому оставляем исправленный командой кэш,
+                # который остается устаревшим и будет перечитан
+                logger.debug("User cache was patched during fetch, keeping it.")
+                return self._user_cache
+            self._store_users(users, loaded_at)
+            logger.info("Successfully fetched and cached %s users.", len(users))
+            await self._persist_snapshot()
+            return users
         except Exception as e:
-            logger.error(f"Failed to fetch users from Google Sheet: {e}", exc_info=True)
+            logger.error(
+                "Failed to fetch users from Google Sheet: %s", e, exc_info=True
+            )
             if self._user_cache is not None:
                 logger.warning("Returning stale user cache due to fetch failure.")
                 return self._user_cache
             return []
 
-    def get_user_by_id(self, telegram_id: int) -> Optional[User]:
-        all_users = self.get_all_users()
-        for user in all_users:
-            if user.telegram_id == telegram_id:
-                return user
-        return None
+    async def get_user_by_id(self, telegram_id: int) -> Optional[User]:
+        # get_all_users обновляет кэш и индекс, если они устарели
+        await self.get_all_users()
+        return self._user_index.get(telegram_id)
+
+    async def refresh(self) -> None:
+        """
+        Обновляет кэш пользователей в фоне, не блокируя цикл событий.
+
+        При ошибке сохраняется текущий кэш: следующая попытка будет через
+        refresh_interval.
+        """
+        async with self._get_fetch_lock():
+            generation = self._cache_generation
+            try:
+                users = await asyncio.to_thread(self._fetch_users)
+            except Exception as e:
+                logger.warning("Background refresh of user cache failed: %s", e)
+                return
+            if generation != self._cache_generation:
+                logger.debug("User cache was invalidated during refresh, skipping.")
+                return
+            self._store_users(users, time.monotonic())
+        logger.debug("User cache refreshed in background: %s users.", len(users))
+        await self._persist_snapshot()
 
     async def add_user(self, user: User) -> None:
         await self.google_api.add_user(user.model_dump())
-        self._user_cache = None
-        self._cache_timestamp = 0
-        logger.info(f"User cache cleared after adding user {user.telegram_id}.")
+        if self._user_cache is not None:
+            self._user_index[user.telegram_id] = user
+            # Новый список, а не append: вызывающий код мог сохранить старый
+            await self._patch_cache([*self._user_cache, user])
+        logger.info("User cache updated after adding user %s.", user.telegram_id)
 
     async def delete_user(self, telegram_id: int) -> bool:
         deleted = await self.google_api.delete_user(telegram_id)
-        if deleted:
-            self._user_cache = None
-            self._cache_timestamp = 0
-            logger.info(f"User cache cleared after deleting user {telegram_id}.")
+        if deleted and self._user_cache is not None:
+            self._user_index.pop(telegram_id, None)
+            await self._patch_cache(
+                [u for u in self._user_cache if u.telegram_id != telegram_id]
+            )
+            logger.info("User cache updated after deleting user %s.", telegram_id)
         return deleted
 
     async def update_user_name(self, telegram_id: int, new_name: str) -> bool:
         updated = await self.google_api.update_user_name(telegram_id, new_name)
-        if updated:
-            self._user_cache = None
-            self._cache_timestamp = 0
+        if updated and self._user_cache is not None:
+            old_user = self._user_index.get(telegram_id)
+            if old_user is not None:
+                new_user = old_user.model_copy(update={"name": new_name})
+                self._user_index[telegram_id] = new_user
+                await self._patch_cache(
+                    [new_user if u is old_user else u for u in self._user_cache]
+                )
             logger.info(
-                f"User cache cleared after updating name for user {telegram_id}."
+                "User cache updated after updating name for user %s.", telegram_id
             )
         return updated
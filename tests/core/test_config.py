@@ -0,0 +1,36 @@
+"""
+Тесты для загрузки настроек.
+"""
+
+import pytest
+
+from app.core.config import get_settings
+
+
+@pytest.fixture
+def env_dir(tmp_path, monkeypatch):
+    """Фикстура: рабочая директория с .env и чистым кэшем настроек."""
+    (tmp_path / ".env").write_text("ISSUE_TYPES=Из файла\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    get_settings.cache_clear()
+    yield tmp_path
+    get_settings.cache_clear()
+
+
+def test_get_settings_is_cached(env_dir):
+    """Тест: Повторные вызовы возвращают один и тот же экземпляр."""
+    assert get_settings() is get_settings()
+
+
+def test_get_settings_reads_env_file_for_missing_fields(env_dir, monkeypatch):
+    """Тест: Поля, которых нет в окружении, берутся из .env."""
+    monkeypatch.delenv("ISSUE_TYPES", raising=False)
+    assert get_settings().issue_types == ("Из файла",)
+
+
+def test_get_settings_skips_env_file_when_environ_is_complete(env_dir, monkeypatch):
+    """Тест: Если все поля заданы через окружение, .env не читается."""
+    monkeypatch.setenv("ISSUE_TYPES", "Из окружения")
+    # Невалидный UTF-8: чтение такого файла завершилось бы ошибкой
+    (env_dir / ".env").write_bytes(b"ISSUE_TYPES=\xff\xfe")
+    assert get_settings().issue_types == ("Из окружения",)
@@ -4,12 +4,22 @@
 
 import pytest
 
+from app.core import decorators
 from app.core.decorators import require_role
 from app.models.user import User
+from app.services.user_service import UserService
 
 # --- Фикстуры для подготовки тестового окружения ---
 
 
+@pytest.fixture(autouse=True)
+def clear_recent_rejections():
+    """Фикстура для очистки списка недавних отказов между тестами."""
+    decorators._recent_rejections.clear()
+    yield
+    decorators._recent_rejections.clear()
+
+
 @pytest.fixture
 def mock_update_context(mocker):
     """Фикстура для создания моков Update и Context."""
@@ -22,7 +32,9 @@ def mock_update_context(mocker):
     mock_update.callback_query = None
 
     # Симулируем наличие user_service в bot_data
-    mock_context.application.bot_data = {"user_service": mocker.MagicMock()}
+    mock_context.application.bot_data = {
+        "user_service": mocker.MagicMock(spec=UserService)
+    }
     # Симулируем наличие user_data
     mock_context.user_data = {}
 
@@ -113,3 +125,52 @@ async def test_require_role_unauthorized(mock_update_context, mocker):
     mock_update.effective_message.reply_text.assert_awaited_once_with(
         "⛔️ У вас нет доступа для выполнения этой команды."
     )
+
+
+@pytest.mark.asyncio
+async def test_require_role_repeated_unauthorized_is_silent(
+    mock_update_context, mocker
+):
+    """
+    Тест: Повторная попытка неизвестного пользователя отклоняется без ответа.
+    """
+    # Arrange
+    mock_update, mock_context = mock_update_context
+    user_service = mock_context.application.bot_data["user_service"]
+    mock_update.effective_user.id = 999
+    user_service.get_user_by_id.return_value = None
+    dummy_handler = mocker.AsyncMock()
+    decorated_handler = require_role("admin")(dummy_handler)
+
+    # Act
+    await decorated_handler(mock_update, mock_context)
+    await decorated_handler(mock_update, mock_context)
+
+    # Assert
+    dummy_handler.assert_not_awaited()
+    assert user_service.get_user_by_id.await_count == 2
+    mock_update.effective_message.reply_text.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_require_role_user_added_after_rejection(mock_update_context, mocker):
+    """
+    Тест: Пользователь, добавленный после отказа, сразу получает доступ.
+    """
+    # Arrange
+    mock_update, mock_context = mock_update_context
+    user_service = mock_context.application.bot_data["user_service"]
+    mock_update.effective_user.id = 300
+    user_service.get_user_by_id.return_value = None
+    dummy_handler = mocker.AsyncMock()
+    decorated_handler = require_role("admin")(dummy_handler)
+    await decorated_handler(mock_update, mock_context)
+
+    # Act
+    user_service.get_user_by_id.return_value = User(
+        telegram_id=300, name="New Admin", role="admin"
+    )
+    await decorated_handler(mock_update, mock_context)
+
+    # Assert
+    dummy_handler.assert_awaited_once()
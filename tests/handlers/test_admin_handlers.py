@@ -6,7 +6,12 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from app.handlers.admin import list_users
+from app.handlers.admin import (
+    _build_user_list_messages,
+    admin_user_callback,
+    delete_user,
+    list_users,
+)
 from app.models.user import User
 from app.services.user_service import UserService
 
@@ -61,28 +66,61 @@ async def test_list_users_success(mock_update_context_for_handlers):
     # Assert
     reply_mock = mock_update.effective_message.reply_text
 
-    # Проверяем, что было отправлено 3 сообщения: 1 заголовок + 2 пользователя
-    assert reply_mock.call_count == 3
+    # Проверяем, что весь список отправлен одним сообщением
+    reply_mock.assert_awaited_once()
+    call_kwargs = reply_mock.call_args.kwargs
+    text = call_kwargs["text"]
+    assert call_kwargs["parse_mode"] == "HTML"
 
-    # Проверяем вызов заголовка
-    first_call_kwargs = reply_mock.call_args_list[0].kwargs
-    assert first_call_kwargs["text"] == "--- 👥 Список пользователей ---"
-
-    # Проверяем карточку первого пользователя (Admin)
-    second_call_kwargs = reply_mock.call_args_list[1].kwargs
-    admin_card_text = second_call_kwargs["text"]
-    assert "👤 <b>Admin</b>" in admin_card_text
-    assert "<code>100</code>" in admin_card_text
-    assert "<i>admin</i>" in admin_card_text
-    assert second_call_kwargs["parse_mode"] == "HTML"
-    assert second_call_kwargs["reply_markup"] is not None
+    # Проверяем заголовок и карточку первого пользователя (Admin)
+    assert text.startswith("--- 👥 Список пользователей ---")
+    assert "👤 <b>Admin</b>" in text
+    assert "<code>100</code>" in text
+    assert "<i>admin</i>" in text
 
     # Проверяем карточку второго пользователя (Technician)
-    third_call_kwargs = reply_mock.call_args_list[2].kwargs
-    tech_card_text = third_call_kwargs["text"]
-    assert "👤 <b>Technician</b>" in tech_card_text
-    assert "<code>200</code>" in tech_card_text
-    assert "<i>technician</i>" in tech_card_text
+    assert "👤 <b>Technician</b>" in text
+    assert "<code>200</code>" in text
+    assert "<i>technician</i>" in text
+
+    # Проверяем, что у каждого пользователя есть своя кнопка удаления
+    buttons = [row[0] for row in call_kwargs["reply_markup"].inline_keyboard]
+    assert [b.callback_data for b in buttons] == ["delete_user:100", "delete_user:200"]
+
+
+@pytest.mark.asyncio
+async def test_list_users_splits_large_list(mock_update_context_for_handlers):
+    """
+    Тест: Большой список разбивается на сообщения в пределах лимитов Telegram.
+    """
+    # Arrange
+    mock_update, mock_context = mock_update_context_for_handlers
+    user_service = mock_context.application.bot_data["user_service"]
+
+    many_users = [
+        User(telegram_id=1000 + i, name=f"User {i}", role="housekeeper")
+        for i in range(150)
+    ]
+    mock_update.effective_user.id = ADMIN_USER.telegram_id
+    user_service.get_user_by_id.return_value = ADMIN_USER
+    user_service.get_all_users.return_value = many_users
+
+    # Act
+    await list_users(mock_update, mock_context)
+
+    # Assert
+    reply_mock = mock_update.effective_message.reply_text
+    assert reply_mock.call_count > 1
+
+    sent_ids = []
+    for call in reply_mock.call_args_list:
+        assert len(call.kwargs["text"]) <= 4096
+        keyboard = call.kwargs["reply_markup"].inline_keyboard
+        assert len(keyboard) <= 100
+        sent_ids.extend(int(row[0].callback_data.split(":")[1]) for row in keyboard)
+
+    # Каждый пользователь попал ровно в одно сообщение
+    assert sent_ids == [u.telegram_id for u in many_users]
 
 
 @pytest.mark.asyncio
@@ -109,3 +147,148 @@ async def test_list_users_empty(mock_update_context_for_handlers):
     mock_update.effective_message.reply_text.assert_awaited_once_with(
         "👥 Список пользователей пуст."
     )
+
+
+def _mock_delete_callback(mock_update, mocker, users: list[User], user_id: int):
+    """Настраивает нажатие кнопки удаления в сообщении со списком пользователей."""
+    text, reply_markup = _build_user_list_messages(users)[0]
+    query = mock_update.callback_query = mocker.MagicMock()
+    query.answer = mocker.AsyncMock()
+    query.edit_message_text = mocker.AsyncMock()
+    query.message.reply_text = mocker.AsyncMock()
+    query.message.text_html = text
+    query.message.reply_markup = reply_markup
+    query.data = f"delete_user:{user_id}"
+    return query
+
+
+@pytest.mark.asyncio
+async def test_admin_user_callback_keeps_rest_of_list(
+    mock_update_context_for_handlers, mocker
+):
+    """
+    Тест: Удаление из сообщения с несколькими карточками сохраняет остальные карточки и кнопки.
+    """
+    # Arrange
+    mock_update, mock_context = mock_update_context_for_handlers
+    user_service = mock_context.application.bot_data["user_service"]
+    users = [*SAMPLE_USERS, User(telegram_id=300, name="Maid", role="housekeeper")]
+    query = _mock_delete_callback(mock_update, mocker, users, 200)
+    mock_update.effective_user.id = ADMIN_USER.telegram_id
+    user_service.get_user_by_id.return_value = ADMIN_USER
+    user_service.delete_user.return_value = True
+
+    # Act
+    await admin_user_callback(mock_update, mock_context)
+
+    # Assert
+    user_service.delete_user.assert_awaited_once_with(200)
+    kwargs = query.edit_message_text.call_args.kwargs
+    assert "<code>200</code>" not in kwargs["text"]
+    assert "<code>100</code>" in kwargs["text"]
+    assert "<code>300</code>" in kwargs["text"]
+    buttons = [row[0].callback_data for row in kwargs["reply_markup"].inline_keyboard]
+    assert buttons == ["delete_user:100", "delete_user:300"]
+    query.message.reply_text.assert_awaited_once_with(
+        "✅ Пользователь <code>200</code> удален.", parse_mode="HTML"
+    )
+
+
+@pytest.mark.asyncio
+async def test_admin_user_callback_replaces_last_card(
+    mock_update_context_for_handlers, mocker
+):
+    """
+    Тест: Если в сообщении была одна карточка, оно заменяется подтверждением.
+    """
+    # Arrange
+    mock_update, mock_context = mock_update_context_for_handlers
+    user_service = mock_context.application.bot_data["user_service"]
+    query = _mock_delete_callback(mock_update, mocker, SAMPLE_USERS[1:], 200)
+    mock_update.effective_user.id = ADMIN_USER.telegram_id
+    user_service.get_user_by_id.return_value = ADMIN_USER
+    user_service.delete_user.return_value = True
+
+    # Act
+    await admin_user_callback(mock_update, mock_context)
+
+    # Assert
+    query.edit_message_text.assert_awaited_once_with(
+        text="✅ Пользователь <code>200</code> удален.", parse_mode="HTML"
+    )
+    query.message.reply_text.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_admin_user_callback_requires_admin(
+    mock_update_context_for_handlers, mocker
+):
+    """
+    Тест: Кнопку удаления может использовать только администратор.
+    """
+    # Arrange
+    mock_update, mock_context = mock_update_context_for_handlers
+    user_service = mock_context.application.bot_data["user_service"]
+
+    mock_update.callback_query = mocker.MagicMock()
+    mock_update.callback_query.answer = mocker.AsyncMock()
+    mock_update.callback_query.data = "delete_user:100"
+    mock_update.effective_user.id = 200
+    user_service.get_user_by_id.return_value = SAMPLE_USERS[1]
+
+    # Act
+    await admin_user_callback(mock_update, mock_context)
+
+    # Assert
+    user_service.delete_user.assert_not_awaited()
+    mock_update.callback_query.answer.assert_awaited_once_with(
+        "⛔️ У вас нет доступа для этого действия.", show_alert=True
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("bad_id", ["abc", "12a", "--5", "²"])
+async def test_delete_user_rejects_invalid_id(mock_update_context_for_handlers, bad_id):
+    """
+    Тест: Команда /deluser отклоняет ID, который не является числом.
+    """
+    # Arrange
+    mock_update, mock_context = mock_update_context_for_handlers
+    user_service = mock_context.application.bot_data["user_service"]
+
+    mock_update.effective_user.id = ADMIN_USER.telegram_id
+    user_service.get_user_by_id.return_value = ADMIN_USER
+    mock_context.args = [bad_id]
+
+    # Act
+    await delete_user(mock_update, mock_context)
+
+    # Assert
+    user_service.delete_user.assert_not_awaited()
+    mock_update.effective_message.reply_text.assert_awaited_once_with(
+        "⚠️ **Ошибка:** Telegram ID должен быть числом."
+    )
+
+
+@pytest.mark.asyncio
+async def test_delete_user_success(mock_update_context_for_handlers):
+    """
+    Тест: Команда /deluser удаляет пользователя по ID.
+    """
+    # Arrange
+    mock_update, mock_context = mock_update_context_for_handlers
+    user_service = mock_context.application.bot_data["user_service"]
+
+    mock_update.effective_user.id = ADMIN_USER.telegram_id
+    user_service.get_user_by_id.return_value = ADMIN_USER
+    user_service.delete_user.return_value = True
+    mock_context.args = ["200"]
+
+    # Act
+    await delete_user(mock_update, mock_context)
+
+    # Assert
+    user_service.delete_user.assert_awaited_once_with(200)
+    mock_update.effective_message.reply_text.assert_awaited_once_with(
+        "✅ Пользователь с ID <code>200</code> успешно удален."
+    )
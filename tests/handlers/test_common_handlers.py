@@ -0,0 +1,64 @@
+"""
+Тесты для общих обработчиков команд.
+"""
+
+import pytest
+
+from app.handlers import common
+from app.models.user import User
+from app.services.user_service import UserService
+
+
+@pytest.mark.asyncio
+async def test_start_updates_changed_name(mocker):
+    """
+    Тест: /start обновляет имя пользователя, не изменяя объект из кэша.
+    """
+    # Arrange
+    mock_update = mocker.MagicMock()
+    mock_context = mocker.MagicMock()
+    mock_update.callback_query = None
+    mock_update.message.reply_html = mocker.AsyncMock()
+    mock_update.effective_user.id = 100
+    mock_update.effective_user.first_name = "New Name"
+
+    cached_user = User(telegram_id=100, name="Old Name", role="admin")
+    user_service = mocker.MagicMock(spec=UserService)
+    user_service.get_user_by_id.return_value = cached_user
+    mock_context.application.bot_data = {"user_service": user_service}
+    mock_context.user_data = {}
+
+    # Act
+    await common.start(mock_update, mock_context)
+
+    # Assert
+    user_service.update_user_name.assert_awaited_once_with(100, "New Name")
+    assert cached_user.name == "Old Name"
+    assert mock_context.user_data["db_user"].name == "New Name"
+    assert "New Name" in mock_update.message.reply_html.call_args.args[0]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("debug", [False, True])
+async def test_error_handler_escapes_error_text(mocker, debug):
+    """
+    Тест: Текст ошибки экранируется в HTML-уведомлении администраторам.
+    """
+    # Arrange
+    mocker.patch.object(common.logger, "isEnabledFor", return_value=debug)
+    mock_context = mocker.MagicMock()
+    mock_context.error = ValueError("a < b & c")
+    mock_context.chat_data = {}
+    mock_context.user_data = {"note": "<x>"}
+    mock_context.bot.send_message = mocker.AsyncMock()
+    mock_context.bot_data = {"admin_ids": (1,)}
+
+    # Act
+    await common.error_handler("raw update", mock_context)
+
+    # Assert
+    text = mock_context.bot.send_message.call_args.kwargs["text"]
+    assert "a &lt; b &amp; c" in text
+    assert "a < b" not in text
+    if debug:
+        assert "&lt;x&gt;" in text
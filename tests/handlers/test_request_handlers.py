@@ -0,0 +1,203 @@
+"""
+Тесты для обработчиков создания и управления заявками.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.handlers import request as request_handler
+from app.models.request import MaintenanceRequest
+from app.models.user import User
+from app.services.google_api import GoogleAPIService
+from app.services.user_service import UserService
+
+# --- Фикстуры ---
+
+
+@pytest.fixture
+def mock_update_context_for_requests(mocker) -> tuple[MagicMock, MagicMock]:
+    """Фикстура для создания моков Update и Context для диалога заявки."""
+    mock_update = mocker.MagicMock()
+    mock_context = mocker.MagicMock()
+
+    mock_update.effective_message.reply_text = mocker.AsyncMock()
+    mock_update.callback_query = None
+
+    google_api = mocker.MagicMock(spec=GoogleAPIService)
+    google_api.upload_photo_to_drive.return_value = "https://drive/photo"
+    mock_context.application.bot_data = {"google_api_service": google_api}
+    mock_context.bot_data = {"issue_types_set": frozenset({"Сантехника"})}
+    mock_context.user_data = {
+        "current_request": MaintenanceRequest(
+            reporter_id=100, reporter_name="Housekeeper"
+        )
+    }
+
+    mocker.patch.object(
+        request_handler.NotificationService,
+        "send_new_request_notification",
+        new=mocker.AsyncMock(),
+    )
+
+    return mock_update, mock_context
+
+
+# --- Тесты ---
+
+
+@pytest.mark.asyncio
+async def test_new_request_start_creates_draft(
+    mock_update_context_for_requests, mocker
+):
+    """
+    Тест: Команда /new создает черновик заявки с данными заявителя.
+    """
+    # Arrange
+    mock_update, mock_context = mock_update_context_for_requests
+    user_service = mocker.MagicMock(spec=UserService)
+    user_service.get_user_by_id.return_value = User(
+        telegram_id=100, name="Housekeeper", role="housekeeper"
+    )
+    mock_context.application.bot_data["user_service"] = user_service
+    mock_update.effective_user.id = 100
+    mock_update.effective_user.first_name = "Housekeeper"
+
+    # Act
+    state = await request_handler.new_request_start(mock_update, mock_context)
+
+    # Assert
+    assert state == request_handler.LOCATION
+    request = mock_context.user_data["current_request"]
+    assert request.reporter_id == 100
+    assert request.reporter_name == "Housekeeper"
+    assert request.status == "new"
+    assert request.request_uuid is not None
+    assert request.created_at is not None
+
+
+@pytest.mark.asyncio
+async def test_get_location_and_issue_type_update_request(
+    mock_update_context_for_requests,
+):
+    """
+    Тест: Местоположение и тип поломки сохраняются в заявке.
+    """
+    # Arrange
+    mock_update, mock_context = mock_update_context_for_requests
+
+    # Act
+    mock_update.effective_message.text = "Номер 101"
+    location_state = await request_handler.get_location(mock_update, mock_context)
+    mock_update.effective_message.text = "Сантехника"
+    issue_state = await request_handler.get_issue_type(mock_update, mock_context)
+
+    # Assert
+    assert location_state == request_handler.ISSUE_TYPE
+    assert issue_state == request_handler.PHOTO
+    request = mock_context.user_data["current_request"]
+    assert request.location == "Номер 101"
+    assert request.issue_type == "Сантехника"
+
+
+@pytest.mark.asyncio
+async def test_get_photo_saves_request(mock_update_context_for_requests):
+    """
+    Тест: Заявка с фото сохраняется, а уведомление содержит ссылку на фото.
+    """
+    # Arrange
+    mock_update, mock_context = mock_update_context_for_requests
+    google_api = mock_context.application.bot_data["google_api_service"]
+    mock_update.effective_message.photo = [MagicMock(file_id="photo-file-id")]
+
+    # Act
+    state = await request_handler.get_photo(mock_update, mock_context)
+
+    # Assert
+    assert state == request_handler.ConversationHandler.END
+    google_api.create_request_row.assert_awaited_once()
+    assert google_api.create_request_row.call_args.args[0]["status"] == "creating"
+    google_api.update_request_after_upload.assert_awaited_once()
+    google_api.delete_request_by_uuid.assert_not_awaited()
+
+    notify = request_handler.NotificationService.send_new_request_notification
+    notified_request = notify.call_args.kwargs["request"]
+    assert notified_request.status == "new"
+    assert notified_request.photo_before_url == "https://drive/photo"
+    assert "current_request" not in mock_context.user_data
+
+
+@pytest.mark.asyncio
+async def test_get_photo_rolls_back_on_upload_failure(
+    mock_update_context_for_requests,
+):
+    """
+    Тест: Если фото не загрузилось, черновая строка заявки удаляется.
+    """
+    # Arrange
+    mock_update, mock_context = mock_update_context_for_requests
+    google_api = mock_context.application.bot_data["google_api_service"]
+    google_api.upload_photo_to_drive.return_value = None
+    mock_update.effective_message.photo = [MagicMock(file_id="photo-file-id")]
+
+    # Act
+    await request_handler.get_photo(mock_update, mock_context)
+
+    # Assert
+    google_api.create_request_row.assert_awaited_once()
+    google_api.update_request_after_upload.assert_not_awaited()
+    google_api.delete_request_by_uuid.assert_awaited_once()
+    google_api.delete_photo_from_drive.assert_not_awaited()
+    request_handler.NotificationService.send_new_request_notification.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_photo_deletes_photo_when_row_insert_fails(
+    mock_update_context_for_requests,
+):
+    """
+    Тест: Если строка заявки не создалась, уже загруженное фото удаляется из Drive.
+    """
+    # Arrange
+    mock_update, mock_context = mock_update_context_for_requests
+    google_api = mock_context.application.bot_data["google_api_service"]
+    google_api.create_request_row.side_effect = Exception("Sheets unavailable")
+    mock_update.effective_message.photo = [MagicMock(file_id="photo-file-id")]
+    request_uuid = mock_context.user_data["current_request"].request_uuid
+
+    # Act
+    state = await request_handler.get_photo(mock_update, mock_context)
+
+    # Assert
+    assert state == request_handler.ConversationHandler.END
+    google_api.update_request_after_upload.assert_not_awaited()
+    google_api.delete_photo_from_drive.assert_awaited_once_with(
+        f"request_{request_uuid}.jpg"
+    )
+    request_handler.NotificationService.send_new_request_notification.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_accept_keeps_html_formatting(mock_update_context_for_requests, mocker):
+    """
+    Тест: При принятии заявки статус заменяется в HTML-тексте сообщения.
+    """
+    # Arrange
+    mock_update, mock_context = mock_update_context_for_requests
+    google_api = mock_context.application.bot_data["google_api_service"]
+    google_api.accept_request.return_value = True
+    technician = User(telegram_id=200, name="Tech <1>", role="technician")
+    mock_context.user_data["db_user"] = technician
+    query = mock_update.callback_query = mocker.MagicMock()
+    query.edit_message_text = mocker.AsyncMock()
+    query.message.text_html = "🚨 <b>Новая заявка</b>\n\nСтатус: 🆕 Новый"
+
+    # Act
+    await request_handler._handle_accept(mock_update, mock_context, "uuid-1")
+
+    # Assert
+    kwargs = query.edit_message_text.call_args.kwargs
+    assert kwargs["parse_mode"] == "HTML"
+    assert kwargs["text"] == (
+        "🚨 <b>Новая заявка</b>\n\nСтатус: 🛠 В работе у Tech &lt;1&gt;"
+    )
@@ -0,0 +1,467 @@
+"""
+Тесты для сервиса GoogleAPIService.
+"""
+
+import threading
+
+import pytest
+
+from app.services import google_api as google_api_module
+from app.services.google_api import GoogleAPIService
+
+# Столбцы A, B и I листа заявок в формате ответа batch_get
+REQUESTS_COLUMNS = [
+    [["uuid-1"], ["uuid-2"], ["uuid-3"]],
+    [["new"], ["in_progress"], ["completed"]],
+    [[], ["200"]],
+]
+
+# Строки листа заявок (колонки A:I) в том виде, в каком их возвращает get()
+REQUESTS_ROWS = {
+    2: ["uuid-1", "new"],
+    3: ["uuid-2", "in_progress", "", "", "", "", "", "", "200"],
+    4: ["uuid-3", "completed"],
+}
+
+
+def _get_request_row(range_name: str) -> list[list[str]]:
+    """Имитирует Worksheet.get() для диапазона строки вида 'A2:I2'."""
+    row = int(range_name.partition(":")[0][1:])
+    return [REQUESTS_ROWS[row]]
+
+
+# Ответ append_row для строки, добавленной в пятую строку листа
+APPEND_RESPONSE = {"updates": {"updatedRange": "requests!A5:L5"}}
+
+# --- Фикстуры ---
+
+
+@pytest.fixture
+def mock_gspread_client(mocker):
+    """Фикстура для подмены клиента gspread."""
+    return mocker.patch.object(
+        google_api_module.gspread, "service_account"
+    ).return_value
+
+
+@pytest.fixture
+def google_api_service(mocker, tmp_path, mock_gspread_client) -> GoogleAPIService:
+    """Фикстура для создания GoogleAPIService без обращения к Google API."""
+    credentials_file = tmp_path / "credentials.json"
+    credentials_file.write_text("{}")
+    mocker.patch.object(google_api_module, "CREDENTIALS_FILE", credentials_file)
+    return GoogleAPIService()
+
+
+# --- Тесты ---
+
+
+def test_worksheets_are_opened_once(google_api_service, mock_gspread_client):
+    """
+    Тест: Таблица и листы открываются один раз и затем берутся из кэша.
+    """
+    # Arrange
+    spreadsheet = mock_gspread_client.open_by_key.return_value
+
+    # Act
+    users_first = google_api_service.get_users_worksheet()
+    users_second = google_api_service.get_users_worksheet()
+    google_api_service.get_requests_worksheet()
+    google_api_service.get_requests_worksheet()
+
+    # Assert
+    assert users_first is users_second
+    mock_gspread_client.open_by_key.assert_called_once()
+    assert spreadsheet.worksheet.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_accept_request_writes_cells_in_one_batch(google_api_service):
+    """
+    Тест: Принятие заявки записывает все ячейки одним batch_update.
+    """
+    # Arrange
+    requests_sheet = google_api_service.get_requests_worksheet()
+    requests_sheet.batch_get.return_value = REQUESTS_COLUMNS
+    requests_sheet.get.side_effect = _get_request_row
+
+    # Act
+    result = await google_api_service.accept_request("uuid-1", 200, "Tech")
+
+    # Assert
+    assert result is True
+    requests_sheet.update_cell.assert_not_called()
+    requests_sheet.batch_update.assert_called_once()
+    data = requests_sheet.batch_update.call_args.args[0]
+    assert data[0] == {"range": "B2", "values": [["in_progress"]]}
+    assert data[1]["range"] == "I2:K2"
+    assert data[1]["values"][0][:2] == [200, "Tech"]
+
+
+@pytest.mark.asyncio
+async def test_complete_request_writes_cells_in_one_batch(google_api_service):
+    """
+    Тест: Завершение заявки записывает статус и время одним batch_update.
+    """
+    # Arrange
+    requests_sheet = google_api_service.get_requests_worksheet()
+    requests_sheet.batch_get.return_value = REQUESTS_COLUMNS
+    requests_sheet.get.side_effect = _get_request_row
+
+    # Act
+    result = await google_api_service.complete_request("uuid-2", 200)
+
+    # Assert
+    assert result is True
+    requests_sheet.batch_update.assert_called_once()
+    data = requests_sheet.batch_update.call_args.args[0]
+    assert [item["range"] for item in data] == ["B3", "L3"]
+    assert data[0]["values"] == [["completed"]]
+
+
+@pytest.mark.asyncio
+async def test_complete_request_reads_row_in_one_request(google_api_service):
+    """
+    Тест: Статус и исполнитель читаются одним запросом строки, без чтения отдельных ячеек.
+    """
+    # Arrange
+    requests_sheet = google_api_service.get_requests_worksheet()
+    requests_sheet.batch_get.return_value = REQUESTS_COLUMNS
+    requests_sheet.get.side_effect = _get_request_row
+
+    # Act
+    wrong_user = await google_api_service.complete_request("uuid-2", 300)
+
+    # Assert
+    assert wrong_user is False
+    requests_sheet.batch_get.assert_called_once()
+    requests_sheet.get.assert_called_once_with("A3:I3")
+    requests_sheet.cell.assert_not_called()
+    requests_sheet.acell.assert_not_called()
+    requests_sheet.batch_update.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_requests_index_is_cached_until_write(google_api_service):
+    """
+    Тест: Индекс заявок читается одним запросом и сбрасывается после записи.
+    """
+    # Arrange
+    requests_sheet = google_api_service.get_requests_worksheet()
+    requests_sheet.batch_get.return_value = REQUESTS_COLUMNS
+    requests_sheet.get.side_effect = _get_request_row
+
+    # Act
+    rejected = await google_api_service.accept_request("uuid-3", 200, "Tech")
+    wrong_user = await google_api_service.complete_request("uuid-2", 300)
+    reads_before_write = requests_sheet.batch_get.call_count
+    await google_api_service.accept_request("uuid-1", 200, "Tech")
+    await google_api_service.accept_request("uuid-1", 200, "Tech")
+
+    # Assert
+    assert rejected is False
+    assert wrong_user is False
+    assert reads_before_write == 1
+    assert requests_sheet.batch_get.call_count == 2
+    requests_sheet.find.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_sheet_calls_run_outside_event_loop_thread(google_api_service):
+    """
+    Тест: Блокирующие вызовы gspread выполняются не в потоке цикла событий.
+    """
+    # Arrange
+    requests_sheet = google_api_service.get_requests_worksheet()
+    call_threads = []
+    requests_sheet.append_row.side_effect = lambda *args, **kwargs: call_threads.append(
+        threading.current_thread()
+    )
+    requests_sheet.row_values.return_value = ["request_uuid", "status"]
+
+    # Act
+    await google_api_service.create_request_row({"request_uuid": "uuid-4"})
+
+    # Assert
+    requests_sheet.append_row.assert_called_once_with(["uuid-4", None])
+    assert call_threads[0] is not threading.current_thread()
+
+
+@pytest.mark.asyncio
+async def test_upload_photo_builds_drive_client_once(google_api_service, mocker):
+    """
+    Тест: Клиент Drive создается один раз и переиспользуется между загрузками.
+    """
+    # Arrange
+    mocker.patch("google.oauth2.service_account.Credentials")
+    mock_build = mocker.patch("googleapiclient.discovery.build")
+    drive_service = mock_build.return_value
+    drive_service.files.return_value.create.return_value.execute.return_value = {
+        "id": "drive-file-id",
+        "webViewLink": "https://drive/photo",
+    }
+    bot = mocker.MagicMock()
+    bot.get_file = mocker.AsyncMock()
+    bot.get_file.return_value.download_as_bytearray = mocker.AsyncMock(
+        return_value=bytearray(b"jpeg")
+    )
+
+    # Act
+    first = await google_api_service.upload_photo_to_drive("f1", "a.jpg", bot)
+    second = await google_api_service.upload_photo_to_drive("f2", "b.jpg", bot)
+
+    # Assert
+    assert first == second == "https://drive/photo"
+    mock_build.assert_called_once()
+    media = drive_service.files.return_value.create.call_args.kwargs["media_body"]
+    assert media.resumable() is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("folder_permissions", "expected_create_calls"),
+    [
+        ([{"type": "anyone", "role": "reader"}], 0),
+        ([{"type": "user", "role": "writer"}], 2),
+    ],
+)
+async def test_upload_photo_skips_file_permission_for_public_folder(
+    google_api_service, mocker, folder_permissions, expected_create_calls
+):
+    """
+    Тест: Если папка открыта по ссылке, разрешение на файл не создается.
+    """
+    # Arrange
+    mocker.patch("google.oauth2.service_account.Credentials")
+    drive_service = mocker.patch("googleapiclient.discovery.build").return_value
+    permissions = drive_service.permissions.return_value
+    permissions.list.return_value.execute.return_value = {
+        "permissions": folder_permissions
+    }
+    bot = mocker.MagicMock()
+    bot.get_file = mocker.AsyncMock()
+    bot.get_file.return_value.download_as_bytearray = mocker.AsyncMock(
+        return_value=bytearray(b"jpeg")
+    )
+
+    # Act
+    await google_api_service.upload_photo_to_drive("f1", "a.jpg", bot)
+    await google_api_service.upload_photo_to_drive("f2", "b.jpg", bot)
+
+    # Assert
+    permissions.list.assert_called_once()
+    assert permissions.create.call_count == expected_create_calls
+
+
+@pytest.mark.asyncio
+async def test_delete_photo_from_drive_deletes_file_by_name(google_api_service, mocker):
+    """
+    Тест: При откате фото находится в папке по имени файла и удаляется.
+    """
+    # Arrange
+    mocker.patch("google.oauth2.service_account.Credentials")
+    drive_service = mocker.patch("googleapiclient.discovery.build").return_value
+    files = drive_service.files.return_value
+    files.list.return_value.execute.return_value = {"files": [{"id": "drive-file-id"}]}
+
+    # Act
+    deleted = await google_api_service.delete_photo_from_drive("request_uuid-1.jpg")
+
+    # Assert
+    assert deleted is True
+    assert "name = 'request_uuid-1.jpg'" in files.list.call_args.kwargs["q"]
+    files.delete.assert_called_once_with(fileId="drive-file-id")
+
+
+@pytest.mark.asyncio
+async def test_create_request_row_caches_headers(google_api_service, mocker):
+    """
+    Тест: Заголовки листа заявок читаются один раз и перечитываются после APIError.
+    """
+    # Arrange
+    requests_sheet = google_api_service.get_requests_worksheet()
+    requests_sheet.row_values.return_value = ["request_uuid", "status"]
+    requests_sheet.append_row.return_value = APPEND_RESPONSE
+    response = mocker.Mock(status_code=400)
+    response.json.return_value = {"error": {"code": 400, "message": "Bad range"}}
+
+    # Act
+    await google_api_service.create_request_row({"request_uuid": "uuid-4"})
+    await google_api_service.create_request_row({"request_uuid": "uuid-5"})
+    requests_sheet.append_row.side_effect = google_api_module.APIError(response)
+    with pytest.raises(google_api_module.APIError):
+        await google_api_service.create_request_row({"request_uuid": "uuid-6"})
+    requests_sheet.append_row.side_effect = None
+    await google_api_service.create_request_row({"request_uuid": "uuid-7"})
+
+    # Assert
+    assert requests_sheet.row_values.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_new_request_row_is_taken_from_append_response(google_api_service):
+    """
+    Тест: После создания заявки ее строка берется из ответа append_row без find().
+    """
+    # Arrange
+    requests_sheet = google_api_service.get_requests_worksheet()
+    requests_sheet.row_values.return_value = ["request_uuid", "status"]
+    requests_sheet.append_row.return_value = APPEND_RESPONSE
+    requests_sheet.get.return_value = [["uuid-5"]]
+
+    # Act
+    await google_api_service.create_request_row(
+        {"request_uuid": "uuid-5", "status": "creating"}
+    )
+    await google_api_service.update_request_after_upload("uuid-5", "https://photo")
+
+    # Assert
+    requests_sheet.find.assert_not_called()
+    requests_sheet.get.assert_called_once_with("A5")
+    data = requests_sheet.batch_update.call_args.args[0]
+    assert [item["range"] for item in data] == ["B5", "E5"]
+
+
+@pytest.mark.asyncio
+async def test_request_without_photo_leaves_no_pending_row(google_api_service):
+    """
+    Тест: Заявка без фото (сразу в статусе 'new') не запоминается как черновик.
+    """
+    # Arrange
+    requests_sheet = google_api_service.get_requests_worksheet()
+    requests_sheet.row_values.return_value = ["request_uuid", "status"]
+    requests_sheet.append_row.return_value = APPEND_RESPONSE
+
+    # Act
+    for i in range(3):
+        await google_api_service.create_request_row(
+            {"request_uuid": f"uuid-skip-{i}", "status": "new"}
+        )
+
+    # Assert
+    assert google_api_service._pending_request_rows == {}
+
+
+@pytest.mark.asyncio
+async def test_stale_pending_row_is_not_overwritten(google_api_service):
+    """
+    Тест: Если в строке из ответа append_row уже другая заявка, строка ищется заново.
+    """
+    # Arrange
+    requests_sheet = google_api_service.get_requests_worksheet()
+    requests_sheet.row_values.return_value = ["request_uuid", "status"]
+    requests_sheet.append_row.return_value = APPEND_RESPONSE
+    await google_api_service.create_request_row(
+        {"request_uuid": "uuid-5", "status": "creating"}
+    )
+    # Строки листа отсортировали вручную: в пятой строке теперь другая заявка
+    requests_sheet.get.return_value = [["uuid-1"]]
+    requests_sheet.find.return_value.row = 2
+
+    # Act
+    deleted = await google_api_service.delete_request_by_uuid("uuid-5")
+
+    # Assert
+    assert deleted is True
+    requests_sheet.find.assert_called_once_with("uuid-5", in_column=1)
+    requests_sheet.delete_rows.assert_called_once_with(2)
+
+
+@pytest.mark.asyncio
+async def test_rollback_shifts_rows_of_pending_requests(google_api_service):
+    """
+    Тест: Удаление строки при откате сдвигает строки остальных новых заявок.
+    """
+    # Arrange
+    requests_sheet = google_api_service.get_requests_worksheet()
+    requests_sheet.row_values.return_value = ["request_uuid", "status"]
+    requests_sheet.append_row.side_effect = [
+        APPEND_RESPONSE,
+        {"updates": {"updatedRange": "requests!A6:L6"}},
+    ]
+    await google_api_service.create_request_row(
+        {"request_uuid": "uuid-5", "status": "creating"}
+    )
+    await google_api_service.create_request_row(
+        {"request_uuid": "uuid-6", "status": "creating"}
+    )
+    requests_sheet.get.side_effect = [[["uuid-5"]], [["uuid-6"]]]
+
+    # Act
+    deleted = await google_api_service.delete_request_by_uuid("uuid-5")
+    await google_api_service.update_request_after_upload("uuid-6", "https://photo")
+
+    # Assert
+    assert deleted is True
+    requests_sheet.delete_rows.assert_called_once_with(5)
+    data = requests_sheet.batch_update.call_args.args[0]
+    assert data[0]["range"] == "B5"
+    requests_sheet.find.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_accept_request_rechecks_row_before_write(google_api_service, mocker):
+    """
+    Тест: Перед записью строка заявки перечитывается, устаревший индекс не приводит к записи.
+    """
+    # Arrange
+    requests_sheet = google_api_service.get_requests_worksheet()
+    requests_sheet.batch_get.return_value = REQUESTS_COLUMNS
+    # В индексе заявка новая, но в таблице ее уже приняли
+    requests_sheet.get.return_value = [["uuid-1", "in_progress"]]
+
+    # Act
+    result = await google_api_service.accept_request("uuid-1", 200, "Tech")
+
+    # Assert
+    assert result is False
+    requests_sheet.get.assert_called_once_with("A2:I2")
+    requests_sheet.batch_update.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_accept_request_reloads_index_when_rows_moved(google_api_service):
+    """
+    Тест: Если строка заявки сдвинулась, индекс перечитывается и запись идет в новую строку.
+    """
+    # Arrange
+    requests_sheet = google_api_service.get_requests_worksheet()
+    requests_sheet.batch_get.side_effect = [
+        REQUESTS_COLUMNS,
+        [[["uuid-0"], ["uuid-1"]], [["new"], ["new"]], []],
+    ]
+    requests_sheet.get.side_effect = [[["uuid-0", "new"]], [["uuid-1", "new"]]]
+
+    # Act
+    result = await google_api_service.accept_request("uuid-1", 200, "Tech")
+
+    # Assert
+    assert result is True
+    assert requests_sheet.batch_get.call_count == 2
+    assert requests_sheet.get.call_args.args == ("A3:I3",)
+    data = requests_sheet.batch_update.call_args.args[0]
+    assert data[0]["range"] == "B3"
+
+
+@pytest.mark.asyncio
+async def test_accept_request_reloads_cached_index_on_miss(google_api_service):
+    """
+    Тест: Если новой заявки нет в закэшированном индексе, индекс перечитывается.
+    """
+    # Arrange
+    requests_sheet = google_api_service.get_requests_worksheet()
+    requests_sheet.batch_get.side_effect = [
+        REQUESTS_COLUMNS,
+        [[["uuid-1"], ["uuid-4"]], [["new"], ["new"]], []],
+    ]
+    requests_sheet.get.return_value = [["uuid-4", "new"]]
+    # Индекс закэширован до создания заявки uuid-4
+    await google_api_service.accept_request("uuid-missing", 200, "Tech")
+
+    # Act
+    result = await google_api_service.accept_request("uuid-4", 200, "Tech")
+
+    # Assert
+    assert result is True
+    assert requests_sheet.batch_get.call_count == 2
+    requests_sheet.get.assert_called_once_with("A3:I3")
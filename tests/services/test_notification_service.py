@@ -0,0 +1,57 @@
+"""
+Тесты для форматирования уведомлений.
+"""
+
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.models.request import MaintenanceRequest
+from app.services import notification_service
+
+
+@pytest.mark.parametrize(
+    "dt",
+    [
+        datetime(2025, 7, 1, 9, 30),
+        datetime(2025, 7, 1, 9, 30, tzinfo=timezone.utc),
+    ],
+)
+def test_format_datetime_converts_to_display_timezone(mocker, dt):
+    """
+    Тест: Время (в том числе "наивное", считающееся UTC) выводится в часовом поясе из настроек.
+    """
+    mocker.patch.object(notification_service, "DISPLAY_TZ", ZoneInfo("Europe/Moscow"))
+    assert notification_service._format_datetime(dt) == "01.07.2025 в 12:30"
+
+
+def test_format_datetime_without_value():
+    """
+    Тест: Отсутствующее время выводится как "не указано".
+    """
+    assert notification_service._format_datetime(None) == "не указано"
+
+
+@pytest.mark.asyncio
+async def test_new_request_notification_escapes_user_input(mocker):
+    """
+    Тест: Уведомление размечено HTML, а введенные пользователем поля экранированы.
+    """
+    bot = mocker.MagicMock()
+    bot.send_message = mocker.AsyncMock()
+    request = MaintenanceRequest(
+        reporter_id=100,
+        reporter_name="Anna <admin>",
+        location="Номер 101 & 102",
+        issue_type="Сантехника",
+    )
+
+    await notification_service.NotificationService.send_new_request_notification(
+        bot=bot, chat_id=-1, request=request
+    )
+
+    text = bot.send_message.call_args.kwargs["text"]
+    assert "<b>Локация:</b> Номер 101 &amp; 102" in text
+    assert "Anna &lt;admin&gt;" in text
+    assert "**" not in text
@@ -2,6 +2,9 @@
 Тесты для UserService.
 """
 
+import asyncio
+import os
+import threading
 from unittest.mock import MagicMock
 
 import pytest
@@ -10,65 +13,108 @@ from app.models.user import User
 from app.services.google_api import GoogleAPIService
 from app.services.user_service import UserService
 
-SAMPLE_USER_RECORDS = [
-    {"telegram_id": 100, "name": "Admin User", "role": "admin"},
-    {"telegram_id": 200, "name": "Technician User", "role": "technician"},
+SAMPLE_USER_ROWS = [
+    ["100", "Admin User", "admin"],
+    ["200", "Technician User", "technician"],
 ]
 
 
-@pytest.fixture
-def mock_google_api_service(mocker) -> MagicMock:
-    """Фикстура для создания мока GoogleAPIService."""
-    mock = mocker.Mock(spec=GoogleAPIService)
-    mock.get_users_worksheet.return_value.get_all_records.return_value = (
-        SAMPLE_USER_RECORDS
-    )
+@pytest.fixture(scope="module")
+def mock_google_api_service(module_mocker) -> MagicMock:
+    """Фикстура для создания мока GoogleAPIService (один на модуль)."""
+    mock = module_mocker.Mock(spec=GoogleAPIService)
 
     # Делаем изменяющие методы асинхронными моками, чтобы их можно было "await"-ить
-    mock.add_user = mocker.AsyncMock()
-    mock.delete_user = mocker.AsyncMock()
-    mock.update_user_name = mocker.AsyncMock()
+    mock.add_user = module_mocker.AsyncMock()
+    mock.delete_user = module_mocker.AsyncMock()
+    mock.update_user_name = module_mocker.AsyncMock()
 
     return mock
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def user_service(mock_google_api_service) -> UserService:
-    """Фикстура для создания экземпляра UserService с моком Google API."""
+    """Фикстура для создания экземпляра UserService с моком Google API (один на модуль)."""
     return UserService(google_api=mock_google_api_service)
 
 
-def test_get_all_users_success(user_service, mock_google_api_service):
+@pytest.fixture(autouse=True)
+def reset_user_service(user_service, mock_google_api_service):
+    """Фикстура для сброса кэша сервиса и состояния мока перед каждым тестом."""
+    mock_google_api_service.reset_mock(return_value=True, side_effect=True)
+    mock_google_api_service.get_users_worksheet.return_value.get_values.return_value = (
+        SAMPLE_USER_ROWS
+    )
+
+    user_service._user_cache = None
+    user_service._user_index = {}
+    user_service._cache_monotonic = float("-inf")
+    user_service._refresh_task = None
+
+
+@pytest.mark.asyncio
+async def test_get_all_users_success(user_service, mock_google_api_service):
     """Тест: Успешное получение и парсинг списка пользователей."""
-    users = user_service.get_all_users()
+    users = await user_service.get_all_users()
     assert len(users) == 2
     assert isinstance(users[0], User)
     assert users[0].telegram_id == 100
     assert users[1].role == "technician"
-    mock_google_api_service.get_users_worksheet.return_value.get_all_records.assert_called_once()
+    mock_google_api_service.get_users_worksheet.return_value.get_values.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_all_users_skips_incomplete_rows(
+    user_service, mock_google_api_service
+):
+    """Тест: Пустые и неполные строки листа пропускаются."""
+    mock_google_api_service.get_users_worksheet.return_value.get_values.return_value = [
+        *SAMPLE_USER_ROWS,
+        ["", "", ""],
+        ["300", "No Role"],
+    ]
+    users = await user_service.get_all_users()
+    assert [user.telegram_id for user in users] == [100, 200]
+    mock_google_api_service.get_users_worksheet.return_value.get_values.assert_called_once_with(
+        "A2:C"
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_all_users_normalizes_roles(user_service, mock_google_api_service):
+    """Тест: Роли из таблицы приводятся к нижнему регистру и интернируются."""
+    mock_google_api_service.get_users_worksheet.return_value.get_values.return_value = [
+        ["100", "Admin User", " Admin"],
+        ["200", "Technician User", "TECHNICIAN"],
+    ]
+    users = await user_service.get_all_users()
+    assert [user.role for user in users] == ["admin", "technician"]
+    assert users[0].role is User(telegram_id=1, name="X", role="ADMIN").role
 
 
-def test_get_all_users_caching(user_service, mock_google_api_service):
+@pytest.mark.asyncio
+async def test_get_all_users_caching(user_service, mock_google_api_service):
     """Тест: Проверка работы кэширования."""
-    first_call_users = user_service.get_all_users()
-    second_call_users = user_service.get_all_users()
+    first_call_users = await user_service.get_all_users()
+    second_call_users = await user_service.get_all_users()
     assert first_call_users is second_call_users
-    mock_google_api_service.get_users_worksheet.return_value.get_all_records.assert_called_once()
+    mock_google_api_service.get_users_worksheet.return_value.get_values.assert_called_once()
 
 
-def test_get_all_users_api_error(user_service, mock_google_api_service):
+@pytest.mark.asyncio
+async def test_get_all_users_api_error(user_service, mock_google_api_service):
     """Тест: Обработка ошибки от Google API."""
     mock_google_api_service.get_users_worksheet.side_effect = Exception("Network Error")
-    users = user_service.get_all_users()
+    users = await user_service.get_all_users()
     assert users == []
 
 
 @pytest.mark.asyncio
-async def test_add_user_clears_cache(user_service, mock_google_api_service):
-    """Тест: Проверка, что добавление пользователя сбрасывает кэш."""
+async def test_add_user_updates_cache(user_service, mock_google_api_service):
+    """Тест: Добавление пользователя дописывает его в кэш без повторного чтения таблицы."""
     # 1. Заполняем кэш
-    user_service.get_all_users()
-    mock_google_api_service.get_users_worksheet.return_value.get_all_records.assert_called_once()
+    users_before = await user_service.get_all_users()
+    mock_google_api_service.get_users_worksheet.return_value.get_values.assert_called_once()
 
     new_user = User(telegram_id=300, name="New Guy", role="housekeeper")
 
@@ -76,10 +122,265 @@ async def test_add_user_clears_cache(user_service, mock_google_api_service):
     await user_service.add_user(new_user)
 
     # 3. Снова запрашиваем всех пользователей
-    user_service.get_all_users()
+    users_after = await user_service.get_all_users()
+
+    # 4. Новый пользователь в кэше, таблица повторно не читалась,
+    #    а ранее полученный список не изменился
+    assert users_after[-1] == new_user
+    assert len(users_before) == 2
+    mock_google_api_service.get_users_worksheet.return_value.get_values.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_delete_and_rename_update_cache(user_service, mock_google_api_service):
+    """Тест: Удаление и переименование меняют кэш без повторного чтения таблицы."""
+    mock_google_api_service.delete_user.return_value = True
+    mock_google_api_service.update_user_name.return_value = True
+    await user_service.get_all_users()
+
+    await user_service.delete_user(200)
+    await user_service.update_user_name(100, "Renamed Admin")
+
+    users = await user_service.get_all_users()
+    assert [(user.telegram_id, user.name) for user in users] == [(100, "Renamed Admin")]
+    assert await user_service.get_user_by_id(200) is None
+    assert (await user_service.get_user_by_id(100)).name == "Renamed Admin"
+    mock_google_api_service.get_users_worksheet.return_value.get_values.assert_called_once()
+
 
-    # 4. Проверяем, что get_all_records был вызван второй раз
+@pytest.mark.asyncio
+async def test_patch_during_fetch_is_not_overwritten(
+    user_service, mock_google_api_service
+):
+    """Тест: Чтение таблицы, начатое до удаления пользователя, не возвращает его в кэш."""
+    # Arrange
+    get_values = mock_google_api_service.get_users_worksheet.return_value.get_values
+    mock_google_api_service.delete_user.return_value = True
+    await user_service.get_all_users()
+    user_service._cache_monotonic = float("-inf")
+
+    started, release = threading.Event(), threading.Event()
+
+    def slow_get_values(_range):
+        started.set()
+        release.wait(5)
+        return SAMPLE_USER_ROWS
+
+    get_values.side_effect = slow_get_values
+
+    # Act
+    load = asyncio.create_task(user_service.get_all_users())
+    await asyncio.to_thread(started.wait, 5)
+    await user_service.delete_user(200)
+    release.set()
+    users = await load
+
+    # Assert
+    assert [user.telegram_id for user in users] == [100]
+    assert 200 not in user_service._user_index
+
+
+@pytest.mark.asyncio
+async def test_get_user_by_id_uses_index(user_service, mock_google_api_service):
+    """Тест: Поиск по ID идет по индексу кэша без повторного чтения таблицы."""
+    assert (await user_service.get_user_by_id(100)).name == "Admin User"
+    assert (await user_service.get_user_by_id(200)).role == "technician"
+    assert await user_service.get_user_by_id(999) is None
+    assert user_service._user_index.keys() == {100, 200}
+    mock_google_api_service.get_users_worksheet.return_value.get_values.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_add_user_patches_lookup_cache(user_service, mock_google_api_service):
+    """Тест: После добавления пользователь сразу находится по ID через кэш."""
+    assert await user_service.get_user_by_id(300) is None
+
+    new_user = User(telegram_id=300, name="New Guy", role="housekeeper")
+    mock_google_api_service.get_users_worksheet.return_value.get_values.return_value = [
+        *SAMPLE_USER_ROWS,
+        [str(new_user.telegram_id), new_user.name, new_user.role],
+    ]
+    await user_service.add_user(new_user)
+
+    assert await user_service.get_user_by_id(300) == new_user
+    mock_google_api_service.get_users_worksheet.return_value.get_values.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_refresh_updates_cache_in_background(
+    user_service, mock_google_api_service
+):
+    """Тест: Фоновое обновление перечитывает таблицу и заменяет кэш."""
+    await user_service.get_all_users()
+    mock_google_api_service.get_users_worksheet.return_value.get_values.return_value = [
+        ["300", "New Guy", "housekeeper"]
+    ]
+
+    await user_service.refresh()
+
+    assert (await user_service.get_user_by_id(300)).name == "New Guy"
+    assert await user_service.get_user_by_id(100) is None
     assert (
-        mock_google_api_service.get_users_worksheet.return_value.get_all_records.call_count
+        mock_google_api_service.get_users_worksheet.return_value.get_values.call_count
         == 2
     )
+
+
+@pytest.mark.asyncio
+async def test_refresh_failure_keeps_cache(user_service, mock_google_api_service):
+    """Тест: Ошибка фонового обновления не сбрасывает текущий кэш."""
+    await user_service.get_all_users()
+    mock_google_api_service.get_users_worksheet.side_effect = Exception("Network Error")
+
+    await user_service.refresh()
+
+    assert (await user_service.get_user_by_id(100)).name == "Admin User"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_cache_misses_fetch_once(
+    user_service, mock_google_api_service
+):
+    """Тест: Одновременные промахи кэша приводят к одному чтению таблицы."""
+    users = await asyncio.gather(*(user_service.get_user_by_id(100) for _ in range(5)))
+    assert all(user.name == "Admin User" for user in users)
+    mock_google_api_service.get_users_worksheet.return_value.get_values.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_cache_ttl_uses_monotonic_clock(
+    user_service, mock_google_api_service, mocker
+):
+    """Тест: TTL кэша считается по монотонным часам, а не по системному времени."""
+    get_values = mock_google_api_service.get_users_worksheet.return_value.get_values
+    monotonic = mocker.patch("app.services.user_service.time.monotonic")
+    monotonic.return_value = 1000.0
+    await user_service.get_all_users()
+
+    # Перевод системных часов не влияет на кэш
+    mocker.patch("time.time", return_value=10**10)
+    await user_service.get_all_users()
+    get_values.assert_called_once()
+
+    # По монотонным часам TTL истек — таблица читается снова
+    monotonic.return_value = 1000.0 + 3600
+    await user_service.get_all_users()
+    await user_service._refresh_task
+    assert get_values.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_cache_is_served_while_refreshing(
+    user_service, mock_google_api_service, mocker
+):
+    """Тест: Устаревший кэш отдается сразу, а таблица перечитывается в фоне."""
+    # Arrange
+    get_values = mock_google_api_service.get_users_worksheet.return_value.get_values
+    monotonic = mocker.patch("app.services.user_service.time.monotonic")
+    monotonic.return_value = 1000.0
+    stale_users = await user_service.get_all_users()
+    get_values.return_value = [["300", "New Guy", "housekeeper"]]
+    monotonic.return_value = 1000.0 + 3600
+
+    # Act
+    users = await asyncio.gather(*(user_service.get_all_users() for _ in range(3)))
+    await user_service._refresh_task
+
+    # Assert
+    assert all(result is stale_users for result in users)
+    assert get_values.call_count == 2
+    assert (await user_service.get_user_by_id(300)).name == "New Guy"
+
+
+@pytest.mark.asyncio
+async def test_too_old_cache_is_reloaded_synchronously(
+    user_service, mock_google_api_service, mocker
+):
+    """Тест: Кэш старше stale_ttl не отдается, а перечитывается сразу."""
+    # Arrange
+    get_values = mock_google_api_service.get_users_worksheet.return_value.get_values
+    monotonic = mocker.patch("app.services.user_service.time.monotonic")
+    monotonic.return_value = 1000.0
+    await user_service.get_all_users()
+    get_values.return_value = [["300", "New Guy", "housekeeper"]]
+    monotonic.return_value = 1000.0 + 86400
+
+    # Act
+    users = await user_service.get_all_users()
+
+    # Assert
+    assert [user.telegram_id for user in users] == [300]
+    assert user_service._refresh_task is None
+
+
+def test_cache_can_be_used_from_several_event_loops(
+    user_service, mock_google_api_service
+):
+    """Тест: Сервис работает из разных циклов событий без ошибок блокировки."""
+    get_values = mock_google_api_service.get_users_worksheet.return_value.get_values
+
+    async def load_concurrently():
+        return await asyncio.gather(*(user_service.get_all_users() for _ in range(2)))
+
+    # Первый цикл событий: блокировка используется с ожиданием
+    asyncio.run(load_concurrently())
+    # Кэш устарел — второй цикл снова читает таблицу под своей блокировкой
+    user_service._cache_monotonic = float("-inf")
+    results = asyncio.run(load_concurrently())
+
+    assert all(len(users) == 2 for users in results)
+    assert get_values.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_snapshot_warms_up_new_instance(mock_google_api_service, tmp_path):
+    """Тест: Новый экземпляр сервиса сразу отдает пользователей из снимка на диске."""
+    # Arrange
+    cache_file = tmp_path / "users_cache.json"
+    await UserService(mock_google_api_service, cache_file=cache_file).get_all_users()
+    get_values = mock_google_api_service.get_users_worksheet.return_value.get_values
+    get_values.side_effect = Exception("Network Error")
+
+    # Act
+    restarted_service = UserService(mock_google_api_service, cache_file=cache_file)
+    user = await restarted_service.get_user_by_id(200)
+    await restarted_service._refresh_task
+
+    # Assert
+    assert user == User(telegram_id=200, name="Technician User", role="technician")
+    assert (await restarted_service.get_user_by_id(100)).role == "admin"
+
+
+@pytest.mark.asyncio
+async def test_old_cache_snapshot_is_ignored(mock_google_api_service, tmp_path):
+    """Тест: Слишком старый снимок не используется, таблица читается сразу."""
+    # Arrange
+    cache_file = tmp_path / "users_cache.json"
+    cache_file.write_bytes(b'[{"telegram_id": 300, "name": "Old", "role": "admin"}]')
+    os.utime(cache_file, (0, 0))
+
+    # Act
+    service = UserService(mock_google_api_service, cache_file=cache_file)
+    users = await service.get_all_users()
+
+    # Assert
+    assert [user.telegram_id for user in users] == [100, 200]
+    assert b'"telegram_id":100' in cache_file.read_bytes()
+
+
+@pytest.mark.asyncio
+async def test_cache_snapshot_follows_admin_changes(mock_google_api_service, tmp_path):
+    """Тест: Удаление пользователя сразу попадает в снимок и не теряется при перезапуске."""
+    # Arrange
+    cache_file = tmp_path / "users_cache.json"
+    mock_google_api_service.delete_user.return_value = True
+    service = UserService(mock_google_api_service, cache_file=cache_file)
+    await service.get_all_users()
+
+    # Act
+    await service.delete_user(200)
+    restarted_service = UserService(mock_google_api_service, cache_file=cache_file)
+
+    # Assert
+    assert [user.telegram_id for user in restarted_service._user_cache] == [100]
+    assert not cache_file.with_suffix(".tmp").exists()
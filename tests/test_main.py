@@ -0,0 +1,50 @@
+"""
+Тесты для маршрутизации нажатий inline-кнопок.
+"""
+
+import pytest
+
+from app import main
+
+
+@pytest.fixture
+def mock_callback_update(mocker):
+    """Фикстура для создания мока Update с callback_query."""
+    mock_update = mocker.MagicMock()
+    mock_update.callback_query.answer = mocker.AsyncMock()
+    return mock_update
+
+
+@pytest.mark.asyncio
+async def test_route_callback_query_dispatches_by_action(mock_callback_update, mocker):
+    """
+    Тест: Нажатие кнопки передается обработчику, выбранному по действию.
+    """
+    # Arrange
+    accept_handler = mocker.AsyncMock()
+    mocker.patch.dict(main.CALLBACK_ROUTES, {"accept_req": accept_handler})
+    mock_callback_update.callback_query.data = "accept_req:uuid-1"
+    mock_context = mocker.MagicMock()
+
+    # Act
+    await main.route_callback_query(mock_callback_update, mock_context)
+
+    # Assert
+    accept_handler.assert_awaited_once_with(mock_callback_update, mock_context)
+
+
+@pytest.mark.asyncio
+async def test_route_callback_query_answers_unknown_action(
+    mock_callback_update, mocker
+):
+    """
+    Тест: Нажатие кнопки с неизвестным действием просто подтверждается.
+    """
+    # Arrange
+    mock_callback_update.callback_query.data = "unknown:42"
+
+    # Act
+    await main.route_callback_query(mock_callback_update, mocker.MagicMock())
+
+    # Assert
+    mock_callback_update.callback_query.answer.assert_awaited_once_with()